@@ -1,3 +1,3 @@
-# Data Engineering Pipeline for Generative AI Fine-tuning
-__version__ = "1.0.0"
-
+# Data Engineering Pipeline for Generative AI Fine-tuning
+__version__ = "1.0.0"
+
@@ -1,4 +1,4 @@
-# Data cleaning and preprocessing module
-
-
-
+# Data cleaning and preprocessing module
+
+
+
@@ -1,185 +1,661 @@
-"""
-Data cleaning and preprocessing module
-"""
-import re
-from typing import List, Dict, Any
-import logging
-
-logger = logging.getLogger(__name__)
-
-class DataCleaner:
-    """Handles data cleaning and preprocessing"""
-    
-    def __init__(self, min_length: int = 10, max_length: int = 5000):
-        """
-        Initialize data cleaner
-        
-        Args:
-            min_length: Minimum text length
-            max_length: Maximum text length
-        """
-        self.min_length = min_length
-        self.max_length = max_length
-    
-    def clean_text(self, text: str) -> str:
-        """
-        Clean a single text string
-        
-        Args:
-            text: Raw text to clean
-            
-        Returns:
-            Cleaned text
-        """
-        if not isinstance(text, str):
-            return ""
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters (keep basic punctuation)
-        text = re.sub(r'[^\w\s\.\,\!\?\;\:\-\(\)]', '', text)
-        
-        # Strip whitespace
-        text = text.strip()
-        
-        return text
-    
-    def clean_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Clean a single data record
-        
-        Args:
-            record: Data record to clean
-            
-        Returns:
-            Cleaned record
-        """
-        cleaned = {}
-        
-        for key, value in record.items():
-            if isinstance(value, str):
-                cleaned[key] = self.clean_text(value)
-            elif isinstance(value, (int, float, bool)):
-                cleaned[key] = value
-            elif isinstance(value, list):
-                cleaned[key] = [self.clean_text(str(item)) if isinstance(item, str) else item 
-                               for item in value]
-            elif isinstance(value, dict):
-                cleaned[key] = self.clean_record(value)
-            else:
-                cleaned[key] = value
-        
-        return cleaned
-    
-    def clean_dataset(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """
-        Clean entire dataset
-        
-        Args:
-            data: List of data records
-            
-        Returns:
-            Cleaned dataset
-        """
-        logger.info(f"Cleaning {len(data)} records...")
-        
-        cleaned_data = []
-        removed_count = 0
-        
-        for record in data:
-            cleaned_record = self.clean_record(record)
-            
-            # Check if record has valid text content
-            has_valid_text = False
-            for value in cleaned_record.values():
-                if isinstance(value, str) and self.min_length <= len(value) <= self.max_length:
-                    has_valid_text = True
-                    break
-            
-            if has_valid_text:
-                cleaned_data.append(cleaned_record)
-            else:
-                removed_count += 1
-        
-        logger.info(f"Cleaned {len(cleaned_data)} records (removed {removed_count} invalid records)")
-        
-        return cleaned_data
-    
-    def remove_duplicates(self, data: List[Dict[str, Any]], key_fields: List[str] = None) -> List[Dict[str, Any]]:
-        """
-        Remove duplicate records
-        
-        Args:
-            data: List of data records
-            key_fields: Fields to use for duplicate detection
-            
-        Returns:
-            Dataset without duplicates
-        """
-        if not key_fields:
-            # Use all string fields for duplicate detection
-            key_fields = []
-            if data:
-                for key, value in data[0].items():
-                    if isinstance(value, str):
-                        key_fields.append(key)
-        
-        if not key_fields:
-            logger.warning("No key fields specified, skipping duplicate removal")
-            return data
-        
-        logger.info(f"Removing duplicates based on fields: {key_fields}")
-        
-        seen = set()
-        unique_data = []
-        duplicate_count = 0
-        
-        for record in data:
-            # Create a tuple of key field values
-            key_tuple = tuple(str(record.get(field, "")) for field in key_fields)
-            
-            if key_tuple not in seen:
-                seen.add(key_tuple)
-                unique_data.append(record)
-            else:
-                duplicate_count += 1
-        
-        logger.info(f"Removed {duplicate_count} duplicates. {len(unique_data)} unique records remaining")
-        
-        return unique_data
-    
-    def remove_empty_fields(self, data: List[Dict[str, Any]], required_fields: List[str] = None) -> List[Dict[str, Any]]:
-        """
-        Remove records with empty required fields
-        
-        Args:
-            data: List of data records
-            required_fields: Fields that must not be empty
-            
-        Returns:
-            Dataset with only records that have required fields
-        """
-        if not required_fields:
-            return data
-        
-        logger.info(f"Removing records with empty required fields: {required_fields}")
-        
-        filtered_data = []
-        removed_count = 0
-        
-        for record in data:
-            has_all_fields = all(
-                record.get(field) and str(record.get(field)).strip()
-                for field in required_fields
-            )
-            
-            if has_all_fields:
-                filtered_data.append(record)
-            else:
-                removed_count += 1
-        
-        logger.info(f"Removed {removed_count} records with empty required fields. {len(filtered_data)} records remaining")
-        
-        return filtered_data
-
+"""
+Data cleaning and preprocessing module
+"""
+import re
+from functools import partial
+from itertools import chain, compress
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+import logging
+
+import numpy as np
+
+from src.utils.hashing import record_hash, record_key_hash, record_key_hashes
+from src.utils.jit_kernels import dedup_mask
+from src.utils.parallel import parallel_map
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow is optional, cleaning falls back to pure Python
+    pa = None
+    pc = None
+
+try:
+    import re2
+except ImportError:  # google-re2 is optional, only needed for regex_backend="re2"
+    re2 = None
+
+try:
+    from rbloom import Bloom
+except ImportError:  # rbloom is optional, only needed for use_bloom
+    Bloom = None
+
+logger = logging.getLogger(__name__)
+
+# Bloom filter capacity when streaming records of unknown count
+DEFAULT_BLOOM_CAPACITY = 1_000_000
+
+# Patterns are compiled once at import since clean_text runs on every string field
+_WHITESPACE_RE = re.compile(r'\s+')
+# Quantified with + so a run of special characters is dropped in one substitution
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\.\,\!\?\;\:\-\(\)]+')
+
+# Same patterns in RE2 syntax for pyarrow.compute and google-re2. RE2 treats \s and
+# \w as ASCII-only, so the Unicode classes used by Python's re are spelled out to
+# keep all paths identical
+_RE2_WHITESPACE_PATTERN = r'[\t-\r\x{1c}-\x{1f}\x{85}\p{Z}]+'
+_RE2_SPECIAL_CHARS_PATTERN = r'[^\p{L}\p{N}_\t-\r\x{1c}-\x{1f}\x{85}\p{Z}\.\,\!\?\;\:\-\(\)]+'
+# Matches any character str.strip() would keep
+_RE2_NON_WHITESPACE_PATTERN = r'[^\t-\r\x{1c}-\x{1f}\x{85}\p{Z}]'
+
+
+def _flat_string_fields(data: List[Dict[str, Any]]) -> Optional[List[str]]:
+    """
+    Find the string columns of a flat dataset with a shared schema
+    
+    Args:
+        data: List of data records
+        
+    Returns:
+        Names of fields holding only strings (or None values), or None if the
+        records have different fields, mix strings with other types in a field
+        or contain nested lists/dicts
+    """
+    fields = data[0].keys()
+    string_fields = set()
+    other_fields = set()
+    
+    for record in data:
+        if record.keys() != fields:
+            return None
+        for key, value in record.items():
+            if isinstance(value, str):
+                string_fields.add(key)
+            elif isinstance(value, (list, dict)):
+                return None
+            elif value is not None:
+                other_fields.add(key)
+    
+    if string_fields & other_fields:
+        return None
+    
+    return [key for key in fields if key in string_fields]
+
+def _string_keys(record: Dict[str, Any]) -> List[str]:
+    """Return the fields of a record holding strings, in record order"""
+    return [key for key, value in record.items() if isinstance(value, str)]
+
+class DataCleaner:
+    """Handles data cleaning and preprocessing"""
+    
+    def __init__(self, min_length: int = 10, max_length: int = 5000, n_workers: int = 1,
+                 use_bloom: bool = False, expected_n: Optional[int] = None, fp_rate: float = 0.001,
+                 regex_backend: str = "re", dedup_whole_record: bool = False):
+        """
+        Initialize data cleaner
+        
+        Args:
+            min_length: Minimum text length
+            max_length: Maximum text length
+            n_workers: Number of worker processes for record-by-record cleaning
+            use_bloom: Track seen records in a Bloom filter instead of a set
+                during streaming and fused duplicate removal (requires rbloom)
+            expected_n: Expected number of records for sizing the Bloom filter
+                (default: dataset length, or DEFAULT_BLOOM_CAPACITY when streaming)
+            fp_rate: Bloom filter false positive rate
+            regex_backend: Regex engine for clean_text, "re" or "re2" (requires
+                google-re2). RE2 matches in linear time without backtracking,
+                which pays off once the cleaning patterns grow alternations
+            dedup_whole_record: Compare whole records (all fields, any order)
+                for duplicate removal instead of key fields
+        """
+        self.min_length = min_length
+        self.max_length = max_length
+        self.n_workers = n_workers
+        self.use_bloom = use_bloom
+        self.expected_n = expected_n
+        self.fp_rate = fp_rate
+        self.dedup_whole_record = dedup_whole_record
+        
+        if use_bloom and Bloom is None:
+            logger.warning("rbloom is not installed, using exact duplicate detection")
+            self.use_bloom = False
+        
+        if regex_backend not in ("re", "re2"):
+            raise ValueError(f"Unsupported regex backend: {regex_backend}")
+        if regex_backend == "re2" and re2 is None:
+            logger.warning("google-re2 is not installed, using re for text cleaning")
+            regex_backend = "re"
+        self.regex_backend = regex_backend
+        
+        if regex_backend == "re2":
+            self._whitespace_re = re2.compile(_RE2_WHITESPACE_PATTERN)
+            self._special_chars_re = re2.compile(_RE2_SPECIAL_CHARS_PATTERN)
+        else:
+            self._whitespace_re = _WHITESPACE_RE
+            self._special_chars_re = _SPECIAL_CHARS_RE
+    
+    def clean_text(self, text: str) -> str:
+        """
+        Clean a single text string
+        
+        Args:
+            text: Raw text to clean
+            
+        Returns:
+            Cleaned text
+        """
+        if not isinstance(text, str):
+            return ""
+        
+        # Remove extra whitespace, remove special characters (keep basic
+        # punctuation) and strip the result
+        return self._special_chars_re.sub('', self._whitespace_re.sub(' ', text)).strip()
+    
+    def clean_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Clean a single data record
+        
+        Args:
+            record: Data record to clean
+            
+        Returns:
+            Cleaned record
+        """
+        clean_text = self.clean_text
+        result = {}
+        # Nested dicts are cleaned from an explicit stack instead of recursing
+        stack = [(result, record)]
+        
+        while stack:
+            cleaned, source = stack.pop()
+            
+            for key, value in source.items():
+                # Exact type check first, it is the common case and cheaper
+                if type(value) is str or isinstance(value, str):
+                    cleaned[key] = clean_text(value)
+                elif isinstance(value, dict):
+                    nested = {}
+                    cleaned[key] = nested
+                    stack.append((nested, value))
+                elif isinstance(value, list):
+                    cleaned[key] = [clean_text(item) if isinstance(item, str) else item
+                                    for item in value]
+                else:
+                    cleaned[key] = value
+        
+        return result
+    
+    def clean_dataset(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Clean entire dataset
+        
+        Args:
+            data: List of data records
+            
+        Returns:
+            Cleaned dataset
+        """
+        logger.info(f"Cleaning {len(data)} records...")
+        
+        cleaned_data = None
+        if pa is not None and data:
+            cleaned_data = self._clean_dataset_arrow(data)
+        if cleaned_data is None:
+            cleaned_data = self._clean_dataset_python(data)
+        
+        removed_count = len(data) - len(cleaned_data)
+        logger.info(f"Cleaned {len(cleaned_data)} records (removed {removed_count} invalid records)")
+        
+        return cleaned_data
+    
+    def clean_iter(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Clean records one at a time as they are consumed
+        
+        Args:
+            records: Iterable of data records
+            
+        Yields:
+            Cleaned records that still have valid text content
+        """
+        kept_count = 0
+        removed_count = 0
+        
+        for record in records:
+            cleaned_record = self._clean_valid_record(record)
+            if cleaned_record is None:
+                removed_count += 1
+                continue
+            kept_count += 1
+            yield cleaned_record
+        
+        logger.info(f"Cleaned {kept_count} records (removed {removed_count} invalid records)")
+    
+    def _clean_dataset_arrow(self, data: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Clean a flat dataset column by column with pyarrow compute kernels
+        
+        Args:
+            data: List of data records
+            
+        Returns:
+            Cleaned dataset, or None if the records need the per-record path
+        """
+        string_fields = _flat_string_fields(data)
+        if string_fields is None:
+            return None
+        
+        columns, keep = self._clean_string_columns(
+            {field: pa.array([record[field] for record in data], type=pa.string())
+             for field in string_fields},
+            len(data)
+        )
+        cleaned_columns = {field: column.to_pylist() for field, column in columns.items()}
+        
+        return [
+            {key: cleaned_columns[key][idx] if key in cleaned_columns else value
+             for key, value in record.items()}
+            for idx, (record, kept) in enumerate(zip(data, keep.to_pylist()))
+            if kept
+        ]
+    
+    def clean_table(self, table: "pa.Table") -> "pa.Table":
+        """
+        Clean a pyarrow Table column-wise
+        
+        Applies the same text cleaning and length filter as clean_dataset
+        to every string column without converting rows to Python objects.
+        
+        Args:
+            table: Table of data records
+            
+        Returns:
+            Cleaned table
+        """
+        logger.info(f"Cleaning {table.num_rows} records...")
+        
+        string_fields = [
+            field.name for field in table.schema
+            if pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+        ]
+        columns, keep = self._clean_string_columns(
+            {field: table.column(field) for field in string_fields},
+            table.num_rows
+        )
+        
+        for field, column in columns.items():
+            table = table.set_column(table.schema.get_field_index(field), field, column)
+        cleaned_table = table.filter(keep)
+        
+        removed_count = table.num_rows - cleaned_table.num_rows
+        logger.info(f"Cleaned {cleaned_table.num_rows} records (removed {removed_count} invalid records)")
+        
+        return cleaned_table
+    
+    def _clean_string_columns(self, columns: Dict[str, Any], num_rows: int) -> Tuple[Dict[str, Any], Any]:
+        """
+        Clean string columns with pyarrow compute kernels
+        
+        Args:
+            columns: Mapping of field name to Arrow string array
+            num_rows: Number of rows in each column
+            
+        Returns:
+            Tuple of (cleaned_columns, keep_mask) where keep_mask marks rows
+            with at least one text field within length bounds
+        """
+        keep = pa.repeat(False, num_rows)
+        cleaned_columns = {}
+        
+        for field, column in columns.items():
+            column = pc.replace_substring_regex(column, _RE2_WHITESPACE_PATTERN, ' ')
+            column = pc.replace_substring_regex(column, _RE2_SPECIAL_CHARS_PATTERN, '')
+            # Only plain spaces are left after whitespace normalization
+            column = pc.utf8_trim(column, ' ')
+            
+            lengths = pc.utf8_length(column)
+            in_range = pc.and_(
+                pc.greater_equal(lengths, self.min_length),
+                pc.less_equal(lengths, self.max_length)
+            )
+            keep = pc.or_(keep, pc.fill_null(in_range, False))
+            cleaned_columns[field] = column
+        
+        return cleaned_columns, keep
+    
+    def _clean_dataset_python(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Clean a dataset record by record
+        
+        Args:
+            data: List of data records
+            
+        Returns:
+            Cleaned dataset
+        """
+        cleaned_records = parallel_map(self.clean_record, data, self.n_workers)
+        
+        return [record for record in cleaned_records if self._has_valid_text(record)]
+    
+    def _clean_valid_record(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Clean a single record and check it still has valid text content
+        
+        Args:
+            record: Data record to clean
+            
+        Returns:
+            Cleaned record, or None if no text field is within length bounds
+        """
+        cleaned_record = self.clean_record(record)
+        
+        return cleaned_record if self._has_valid_text(cleaned_record) else None
+    
+    def _has_valid_text(self, record: Dict[str, Any]) -> bool:
+        """Check if any text field of a cleaned record is within length bounds"""
+        min_length = self.min_length
+        max_length = self.max_length
+        for value in record.values():
+            if isinstance(value, str) and min_length <= len(value) <= max_length:
+                return True
+        return False
+    
+    def remove_duplicates(self, data: List[Dict[str, Any]], key_fields: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Remove duplicate records
+        
+        Records are compared by a 64-bit hash of their key field values, so
+        8 bytes per record are held instead of a tuple of key strings per
+        unique record. The main gain is memory; speed is only modestly
+        better than a set of key tuples. Exact duplicates only;
+        near-duplicates could be caught by swapping the hash for MinHash
+        signatures (128 permutations) bucketed with LSH (20 bands x 5 rows
+        gives a ~0.85 Jaccard threshold).
+        
+        use_bloom is ignored here; it only applies to remove_duplicates_iter
+        and first_occurrence_filter, which cannot hold every hash at once.
+        
+        Args:
+            data: List of data records
+            key_fields: Fields to use for duplicate detection
+            
+        Returns:
+            Dataset without duplicates
+        """
+        if self.dedup_whole_record:
+            logger.info("Removing duplicates based on whole records")
+            hashes = np.fromiter(map(record_hash, data), dtype=np.uint64, count=len(data))
+        else:
+            if not key_fields:
+                # Use all string fields of the first record for duplicate detection
+                key_fields = _string_keys(data[0]) if data else []
+            
+            if not key_fields:
+                logger.warning("No key fields specified, skipping duplicate removal")
+                return list(data)
+            
+            logger.info(f"Removing duplicates based on fields: {key_fields}")
+            hashes = record_key_hashes(data, key_fields)
+        
+        # Find first occurrences of the hashes in one compiled pass
+        unique_data = list(compress(data, dedup_mask(hashes).tolist()))
+        
+        duplicate_count = len(data) - len(unique_data)
+        logger.info(f"Removed {duplicate_count} duplicates. {len(unique_data)} unique records remaining")
+        
+        return unique_data
+    
+    def remove_duplicates_iter(self, records: Iterable[Dict[str, Any]], key_fields: List[str] = None,
+                               expected_n: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Remove duplicate records as they are consumed
+        
+        Args:
+            records: Iterable of data records
+            key_fields: Fields to use for duplicate detection
+            expected_n: Number of records, if known, for sizing the Bloom filter
+            
+        Yields:
+            First occurrence of each record
+        """
+        records = iter(records)
+        
+        if self.dedup_whole_record:
+            logger.info("Removing duplicates based on whole records")
+            key_hash = record_hash
+        else:
+            if not key_fields:
+                # Use all string fields of the first record for duplicate detection
+                key_fields = []
+                first = next(records, None)
+                if first is not None:
+                    key_fields = _string_keys(first)
+                    records = chain([first], records)
+            
+            if not key_fields:
+                logger.warning("No key fields specified, skipping duplicate removal")
+                yield from records
+                return
+            
+            logger.info(f"Removing duplicates based on fields: {key_fields}")
+            key_hash = partial(record_key_hash, key_fields=key_fields)
+        
+        if self.use_bloom:
+            capacity = self.expected_n or expected_n or DEFAULT_BLOOM_CAPACITY
+            seen = Bloom(max(capacity, 1), self.fp_rate)
+        else:
+            seen = set()
+        unique_count = 0
+        duplicate_count = 0
+        
+        for record in records:
+            record_key = key_hash(record)
+            
+            if record_key not in seen:
+                seen.add(record_key)
+                unique_count += 1
+                yield record
+            else:
+                duplicate_count += 1
+        
+        logger.info(f"Removed {duplicate_count} duplicates. {unique_count} unique records remaining")
+    
+    def first_occurrence_filter(self, key_fields: List[str] = None,
+                                expected_n: Optional[int] = None) -> Callable[[Dict[str, Any]], bool]:
+        """
+        Build a predicate that accepts each record key only the first time
+        
+        Applying it to records in order keeps the same records as
+        remove_duplicates_iter, including taking the key fields from the
+        string fields of the first record checked when none are given.
+        
+        Args:
+            key_fields: Fields to use for duplicate detection
+            expected_n: Number of records, if known, for sizing the Bloom filter
+            
+        Returns:
+            Function returning True for a record not seen before
+        """
+        if self.use_bloom:
+            capacity = self.expected_n or expected_n or DEFAULT_BLOOM_CAPACITY
+            seen = Bloom(max(capacity, 1), self.fp_rate)
+        else:
+            seen = set()
+        fields = list(key_fields) if key_fields else None
+        
+        def is_first_occurrence(record: Dict[str, Any]) -> bool:
+            nonlocal fields
+            if self.dedup_whole_record:
+                key_hash = record_hash(record)
+            else:
+                if fields is None:
+                    fields = _string_keys(record)
+                    if fields:
+                        logger.info(f"Removing duplicates based on fields: {fields}")
+                    else:
+                        logger.warning("No key fields specified, skipping duplicate removal")
+                if not fields:
+                    return True
+                key_hash = record_key_hash(record, fields)
+            
+            if key_hash in seen:
+                return False
+            seen.add(key_hash)
+            return True
+        
+        return is_first_occurrence
+    
+    def has_required_fields(self, record: Dict[str, Any], required_fields: List[str]) -> bool:
+        """
+        Check that a record has a non-empty value for every required field
+        
+        Args:
+            record: Data record
+            required_fields: Fields that must not be empty
+            
+        Returns:
+            True if no required field is missing or blank
+        """
+        return all(
+            record.get(field) and str(record.get(field)).strip()
+            for field in required_fields
+        )
+    
+    def remove_table_duplicates(self, table: "pa.Table", key_fields: List[str] = None) -> "pa.Table":
+        """
+        Remove duplicate rows from a pyarrow Table
+        
+        Keeps the first occurrence of each key, like remove_duplicates, but
+        compares the joined key strings exactly with a hash aggregation
+        instead of hashing rows in Python. Null keys compare as "", as a
+        field missing from a record does on the record path.
+        
+        Args:
+            table: Table of data records
+            key_fields: Fields to use for duplicate detection (default: the
+                string fields of the first row)
+            
+        Returns:
+            Table without duplicate rows
+        """
+        if self.dedup_whole_record:
+            logger.info("Removing duplicates based on whole records")
+            # record_hash skips None fields, so the union schema's null
+            # columns don't make rows differ from their source records
+            hashes = np.fromiter(map(record_hash, table.to_pylist()), dtype=np.uint64, count=table.num_rows)
+            unique_table = table.filter(pa.array(dedup_mask(hashes)))
+            logger.info(f"Removed {table.num_rows - unique_table.num_rows} duplicates. "
+                        f"{unique_table.num_rows} unique records remaining")
+            return unique_table
+        
+        if not key_fields and table.num_rows > 0:
+            first = table.slice(0, 1).to_pylist()[0]
+            key_fields = _string_keys(first)
+        
+        if not key_fields:
+            logger.warning("No key fields specified, skipping duplicate removal")
+            return table
+        
+        logger.info(f"Removing duplicates based on fields: {key_fields}")
+        
+        key_columns = []
+        for field in key_fields:
+            if field not in table.column_names:
+                column = pa.repeat("", table.num_rows)
+            else:
+                # Nulls are fields a record did not have, matching record.get(field, "")
+                column = pc.fill_null(table.column(field).cast(pa.string()), "")
+            key_columns.append(column)
+        keys = pc.binary_join_element_wise(*key_columns, "\x1f")
+        
+        first_rows = pa.table({"key": keys, "row": np.arange(table.num_rows)}) \
+            .group_by("key", use_threads=False) \
+            .aggregate([("row", "min")])
+        unique_table = table.take(np.sort(first_rows.column("row_min").to_numpy()))
+        
+        duplicate_count = table.num_rows - unique_table.num_rows
+        logger.info(f"Removed {duplicate_count} duplicates. {unique_table.num_rows} unique records remaining")
+        
+        return unique_table
+    
+    def remove_table_empty_fields(self, table: "pa.Table", required_fields: List[str] = None) -> "pa.Table":
+        """
+        Remove rows with empty required fields from a pyarrow Table
+        
+        Args:
+            table: Table of data records
+            required_fields: Fields that must not be empty
+            
+        Returns:
+            Table with only rows that have required fields
+        """
+        if not required_fields:
+            return table
+        
+        logger.info(f"Removing records with empty required fields: {required_fields}")
+        
+        keep = pa.chunked_array([pa.repeat(True, table.num_rows)])
+        for field in required_fields:
+            if field not in table.column_names:
+                keep = pa.chunked_array([pa.repeat(False, table.num_rows)])
+                break
+            
+            column = table.column(field)
+            if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+                present = pc.match_substring_regex(column, _RE2_NON_WHITESPACE_PATTERN)
+            else:
+                present = pa.array([bool(value and str(value).strip()) for value in column.to_pylist()])
+            keep = pc.and_(keep, pc.fill_null(present, False))
+        
+        kept_table = table.filter(keep)
+        removed_count = table.num_rows - kept_table.num_rows
+        logger.info(f"Removed {removed_count} records with empty required fields. {kept_table.num_rows} records remaining")
+        
+        return kept_table
+    
+    def remove_empty_fields(self, data: List[Dict[str, Any]], required_fields: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Remove records with empty required fields
+        
+        Args:
+            data: List of data records
+            required_fields: Fields that must not be empty
+            
+        Returns:
+            Dataset with only records that have required fields
+        """
+        if not required_fields:
+            return data
+        
+        return list(self.remove_empty_fields_iter(data, required_fields))
+    
+    def remove_empty_fields_iter(self, records: Iterable[Dict[str, Any]], required_fields: List[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Remove records with empty required fields as they are consumed
+        
+        Args:
+            records: Iterable of data records
+            required_fields: Fields that must not be empty
+            
+        Yields:
+            Records that have all required fields
+        """
+        if not required_fields:
+            yield from records
+            return
+        
+        logger.info(f"Removing records with empty required fields: {required_fields}")
+        
+        kept_count = 0
+        removed_count = 0
+        
+        for record in records:
+            if self.has_required_fields(record, required_fields):
+                kept_count += 1
+                yield record
+            else:
+                removed_count += 1
+        
+        logger.info(f"Removed {removed_count} records with empty required fields. {kept_count} records remaining")
+
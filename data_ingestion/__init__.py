@@ -1,2 +1,2 @@
-# Data ingestion module
-
+# Data ingestion module
+
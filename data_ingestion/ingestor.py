@@ -1,116 +1,504 @@
-"""
-Data ingestion module - loads data from various sources
-"""
-import pandas as pd
-import json
-import jsonlines
-from pathlib import Path
-from typing import List, Dict, Any
-import logging
-
-logger = logging.getLogger(__name__)
-
-class DataIngestor:
-    """Handles data ingestion from various file formats"""
-    
-    def __init__(self, supported_formats: List[str] = None):
-        """
-        Initialize data ingestor
-        
-        Args:
-            supported_formats: List of supported file formats
-        """
-        self.supported_formats = supported_formats or ["json", "jsonl", "csv", "txt"]
-    
-    def load_data(self, file_path: str) -> List[Dict[str, Any]]:
-        """
-        Load data from file based on format
-        
-        Args:
-            file_path: Path to data file
-            
-        Returns:
-            List of data records
-        """
-        file_path = Path(file_path)
-        file_extension = file_path.suffix.lower().lstrip('.')
-        
-        if file_extension not in self.supported_formats:
-            raise ValueError(f"Unsupported file format: {file_extension}")
-        
-        logger.info(f"Loading data from {file_path}")
-        
-        if file_extension == "json":
-            return self._load_json(file_path)
-        elif file_extension == "jsonl":
-            return self._load_jsonl(file_path)
-        elif file_extension == "csv":
-            return self._load_csv(file_path)
-        elif file_extension == "txt":
-            return self._load_txt(file_path)
-    
-    def _load_json(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Load JSON file"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # If it's a list, return directly; if it's a dict, convert to list
-        if isinstance(data, list):
-            return data
-        elif isinstance(data, dict):
-            return [data]
-        else:
-            raise ValueError("Invalid JSON format")
-    
-    def _load_jsonl(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Load JSONL file"""
-        data = []
-        with jsonlines.open(file_path) as reader:
-            for obj in reader:
-                data.append(obj)
-        return data
-    
-    def _load_csv(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Load CSV file"""
-        df = pd.read_csv(file_path)
-        return df.to_dict('records')
-    
-    def _load_txt(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Load text file (one record per line)"""
-        data = []
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if line:
-                    data.append({
-                        "text": line,
-                        "line_number": line_num
-                    })
-        return data
-    
-    def load_from_directory(self, directory: str, pattern: str = "*") -> List[Dict[str, Any]]:
-        """
-        Load all matching files from a directory
-        
-        Args:
-            directory: Directory path
-            pattern: File pattern to match
-            
-        Returns:
-            Combined list of all records
-        """
-        directory = Path(directory)
-        all_data = []
-        
-        for file_path in directory.glob(pattern):
-            if file_path.is_file():
-                try:
-                    data = self.load_data(str(file_path))
-                    all_data.extend(data)
-                    logger.info(f"Loaded {len(data)} records from {file_path.name}")
-                except Exception as e:
-                    logger.error(f"Error loading {file_path}: {e}")
-        
-        logger.info(f"Total records loaded: {len(all_data)}")
-        return all_data
-
+"""
+Data ingestion module - loads data from various sources
+"""
+import fnmatch
+import mmap
+import os
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+import logging
+
+from src.utils.arrow_utils import records_to_table
+from src.utils.hashing import hash_text
+from src.utils.json_utils import loads
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.json as pajson
+    import pyarrow.parquet as pq
+    from pyarrow import csv as pacsv
+except ImportError:  # pyarrow is optional, CSV loading falls back to pandas
+    pa = None
+    pc = None
+    pajson = None
+    pq = None
+    pacsv = None
+
+try:
+    import cudf
+except ImportError:  # cudf is optional, only used for very large JSONL files
+    cudf = None
+
+# Bytes parsed per Arrow CSV block; column types are inferred from the first block
+CSV_BLOCK_SIZE = 8 << 20
+
+# JSONL files at least this large are parsed with pyarrow's JSON reader,
+# and on the GPU with cudf from CUDF_JSONL_MIN_BYTES
+ARROW_JSONL_MIN_BYTES = 64 << 20
+CUDF_JSONL_MIN_BYTES = 1 << 30
+JSONL_BLOCK_SIZE = 64 << 20
+
+logger = logging.getLogger(__name__)
+
+
+def _is_flat_json_type(data_type: "pa.DataType") -> bool:
+    """
+    Check that a JSON column's values convert back exactly as parsed
+    
+    Structs fill keys a nested object lacks with None, and floats or
+    timestamps inside lists cannot be checked column by column.
+    
+    Args:
+        data_type: Arrow type of a top-level column
+        
+    Returns:
+        True if the column holds no structs and its lists hold no floats or
+        timestamps
+    """
+    if pa.types.is_struct(data_type):
+        return False
+    if pa.types.is_list(data_type) or pa.types.is_large_list(data_type):
+        value_type = data_type.value_type
+        if pa.types.is_floating(value_type) or pa.types.is_temporal(value_type):
+            return False
+        return _is_flat_json_type(value_type)
+    return True
+
+class DataIngestor:
+    """Handles data ingestion from various file formats"""
+    
+    def __init__(self, supported_formats: List[str] = None, chunk_size: int = 10000,
+                 n_workers: Optional[int] = None):
+        """
+        Initialize data ingestor
+        
+        Args:
+            supported_formats: List of supported file formats
+            chunk_size: Number of records per batch for streaming readers
+            n_workers: Number of threads loading files from a directory
+                (default: ThreadPoolExecutor's default)
+        """
+        self.supported_formats = supported_formats or ["json", "jsonl", "csv", "txt"]
+        self.chunk_size = chunk_size
+        self.n_workers = n_workers
+    
+    def load_data(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        Load data from file based on format
+        
+        Args:
+            file_path: Path to data file
+            
+        Returns:
+            List of data records
+        """
+        file_path = Path(file_path)
+        file_extension = self._file_format(file_path)
+        
+        logger.info(f"Loading data from {file_path}")
+        
+        if file_extension == "json":
+            return self._load_json(file_path)
+        elif file_extension == "jsonl":
+            return self._load_jsonl(file_path)
+        elif file_extension == "csv":
+            return self._load_csv(file_path)
+        elif file_extension == "txt":
+            return self._load_txt(file_path)
+    
+    def load_data_cached(self, file_path: str, cache_dir: str) -> List[Dict[str, Any]]:
+        """
+        Load data from file, reusing a Parquet copy written by an earlier run
+        
+        The first call parses the file with load_data and stores the records
+        in cache_dir as zstd-compressed Parquet, keyed on the file's path,
+        modification time and size. While the file is unchanged, later calls
+        memory-map that copy instead of re-parsing the source. Records that do
+        not survive an Arrow round trip unchanged (fields missing from some
+        records, ints mixed with floats, ...) are not cached.
+        
+        Args:
+            file_path: Path to data file
+            cache_dir: Directory for cached Parquet files
+            
+        Returns:
+            List of data records
+        """
+        if pq is None:
+            return self.load_data(file_path)
+        
+        cache_path = self._cache_path(Path(file_path), Path(cache_dir))
+        if cache_path.exists():
+            logger.info(f"Loading cached data for {file_path} from {cache_path}")
+            return pq.read_table(cache_path, memory_map=True).to_pylist()
+        
+        data = self.load_data(file_path)
+        if not data:
+            return data
+        
+        try:
+            table = records_to_table(data)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.warning(f"Not caching {file_path}, records cannot be converted to Arrow ({e})")
+            return data
+        
+        if table.to_pylist() != data:
+            logger.warning(f"Not caching {file_path}, records change when stored as Arrow data")
+            return data
+        
+        # Write under a temporary name so a crash never leaves a partial cache file
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix('.tmp')
+        pq.write_table(table, temp_path, compression='zstd')
+        os.replace(temp_path, cache_path)
+        logger.info(f"Cached {table.num_rows} records from {file_path} to {cache_path}")
+        
+        return data
+    
+    def _cache_path(self, file_path: Path, cache_dir: Path) -> Path:
+        """Return the cache file for the current version of a data file"""
+        stat = file_path.stat()
+        key = f"{file_path.resolve()}\x1f{stat.st_mtime_ns}\x1f{stat.st_size}"
+        return cache_dir / f"{hash_text(key):016x}.parquet"
+    
+    def iter_data(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream records from a file based on format
+        
+        JSONL, CSV and TXT files are read incrementally; a JSON document is
+        parsed whole and then yielded record by record.
+        
+        Args:
+            file_path: Path to data file
+            
+        Yields:
+            Data records
+        """
+        file_path = Path(file_path)
+        file_extension = self._file_format(file_path)
+        
+        logger.info(f"Streaming data from {file_path}")
+        
+        if file_extension == "json":
+            yield from self._load_json(file_path)
+        elif file_extension == "jsonl":
+            yield from self.iter_jsonl(file_path)
+        elif file_extension == "csv":
+            for batch in self.iter_csv(file_path):
+                yield from batch
+        elif file_extension == "txt":
+            yield from self._iter_txt(file_path)
+    
+    def _file_format(self, file_path: Path) -> str:
+        """Return the file format of a path, raising ValueError if unsupported"""
+        file_extension = file_path.suffix.lower().lstrip('.')
+        
+        if file_extension not in self.supported_formats:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+        
+        return file_extension
+    
+    def _load_json(self, file_path: Path) -> List[Dict[str, Any]]:
+        """Load JSON file"""
+        with open(file_path, 'rb') as f:
+            data = loads(f.read())
+        
+        # If it's a list, return directly; if it's a dict, convert to list
+        if isinstance(data, list):
+            return data
+        elif isinstance(data, dict):
+            return [data]
+        else:
+            raise ValueError("Invalid JSON format")
+    
+    def _load_jsonl(self, file_path: Path) -> List[Dict[str, Any]]:
+        """Load JSONL file"""
+        if pajson is not None and os.path.getsize(file_path) >= ARROW_JSONL_MIN_BYTES:
+            data = self.load_jsonl_arrow(file_path)
+            if data is not None:
+                return data
+        return list(self.iter_jsonl(file_path))
+    
+    def load_jsonl_arrow(self, file_path: Path) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load a JSONL file with a vectorized JSON parser
+        
+        Uses cudf for files of at least CUDF_JSONL_MIN_BYTES when it is
+        installed, otherwise pyarrow's multithreaded block reader. Records are
+        converted to dicts only once the whole file is parsed. Values match
+        the line-by-line parser: date/time-like strings stay strings, and
+        fields a record did not have are left out rather than set to None.
+        
+        Args:
+            file_path: Path to JSONL file
+            
+        Returns:
+            List of data records, or None if the file needs the line-by-line
+            parser (a field mixes types, integers would be read as floats, or
+            a field holds nested objects)
+        """
+        try:
+            if cudf is not None and os.path.getsize(file_path) >= CUDF_JSONL_MIN_BYTES:
+                table = cudf.read_json(file_path, lines=True).to_arrow()
+            else:
+                table = self._read_json_table(file_path)
+            
+            # Arrow turns date/time-like strings into timestamps; read those
+            # columns again as plain strings
+            temporal_columns = [
+                pa.field(field.name, pa.string()) for field in table.schema if pa.types.is_temporal(field.type)
+            ]
+            if temporal_columns:
+                column_names = table.column_names
+                table = self._read_json_table(file_path, pa.schema(temporal_columns)).select(column_names)
+        except pa.ArrowInvalid as e:
+            logger.warning(f"Arrow JSON reader failed on {file_path} ({e}), parsing line by line")
+            return None
+        
+        for field in table.schema:
+            if not _is_flat_json_type(field.type):
+                logger.info(f"Parsing {file_path} line by line to keep the nested values in {field.name}")
+                return None
+            
+            # Arrow promotes a column mixing ints and floats to double
+            if pa.types.is_floating(field.type):
+                column = table.column(field.name)
+                if pc.any(pc.equal(column, pc.floor(column))).as_py():
+                    logger.info(f"Parsing {file_path} line by line to keep integer values in {field.name}")
+                    return None
+        
+        records = table.to_pylist()
+        
+        # Nulls are mostly fields a record did not have (an explicit null
+        # reads the same), so drop them to match the line-by-line parser
+        nullable_fields = [name for name in table.column_names if table.column(name).null_count]
+        if nullable_fields:
+            for record in records:
+                for name in nullable_fields:
+                    if record[name] is None:
+                        del record[name]
+        
+        return records
+    
+    def _read_json_table(self, file_path: Path, column_types: "pa.Schema" = None) -> "pa.Table":
+        """Read a JSONL file with pyarrow, forcing the given column types"""
+        parse_options = None
+        if column_types is not None:
+            parse_options = pajson.ParseOptions(
+                explicit_schema=column_types,
+                unexpected_field_behavior="infer"
+            )
+        return pajson.read_json(
+            file_path,
+            read_options=pajson.ReadOptions(block_size=JSONL_BLOCK_SIZE),
+            parse_options=parse_options
+        )
+    
+    def iter_jsonl(self, file_path: Path) -> Iterator[Dict[str, Any]]:
+        """
+        Stream records from a JSONL file one line at a time
+        
+        Args:
+            file_path: Path to JSONL file
+            
+        Yields:
+            Data records
+        """
+        for _, line in self._iter_lines(file_path):
+            yield loads(line)
+    
+    def _load_csv(self, file_path: Path) -> List[Dict[str, Any]]:
+        """Load CSV file"""
+        if pacsv is None:
+            return pd.read_csv(file_path).to_dict('records')
+        
+        try:
+            return [record for batch in self._iter_csv_arrow(file_path) for record in batch]
+        except pa.ArrowInvalid as e:
+            logger.warning(f"Arrow CSV reader failed on {file_path} ({e}), retrying with pandas")
+            return pd.read_csv(file_path).to_dict('records')
+    
+    def iter_csv(self, file_path: Path) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream records from a CSV file in batches
+        
+        Uses pyarrow's multithreaded streaming reader when available, so only
+        one block of the file is held in memory at a time. Column types are
+        inferred from the first block; if a later block does not match them,
+        the rest of the file is read with pandas in chunks instead.
+        
+        Args:
+            file_path: Path to CSV file
+            
+        Yields:
+            Lists of at most chunk_size data records
+        """
+        rows_read = 0
+        if pacsv is not None:
+            try:
+                for records in self._iter_csv_arrow(file_path):
+                    rows_read += len(records)
+                    yield records
+                return
+            except pa.ArrowInvalid as e:
+                logger.warning(
+                    f"Arrow CSV reader failed on {file_path} after {rows_read} rows ({e}), "
+                    f"reading the rest with pandas"
+                )
+        
+        for chunk in pd.read_csv(file_path, chunksize=self.chunk_size):
+            records = chunk.to_dict('records')
+            if rows_read:
+                # Skip the rows the Arrow reader already yielded
+                skipped = min(rows_read, len(records))
+                records = records[skipped:]
+                rows_read -= skipped
+            if records:
+                yield records
+    
+    def _iter_csv_arrow(self, file_path: Path) -> Iterator[List[Dict[str, Any]]]:
+        """Stream records from a CSV file in batches with pyarrow's streaming reader"""
+        with self._open_csv_reader(file_path) as reader:
+            for batch in reader:
+                for start in range(0, batch.num_rows, self.chunk_size):
+                    yield batch.slice(start, self.chunk_size).to_pylist()
+    
+    def _open_csv_reader(self, file_path: Path) -> "pacsv.CSVStreamingReader":
+        """Open an Arrow CSV reader that keeps date/time columns as strings like pandas"""
+        read_options = pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE, use_threads=True)
+        reader = pacsv.open_csv(file_path, read_options=read_options)
+        
+        temporal_columns = {
+            field.name: pa.string() for field in reader.schema if pa.types.is_temporal(field.type)
+        }
+        if not temporal_columns:
+            return reader
+        
+        reader.close()
+        return pacsv.open_csv(
+            file_path,
+            read_options=read_options,
+            convert_options=pacsv.ConvertOptions(column_types=temporal_columns)
+        )
+    
+    def _load_txt(self, file_path: Path) -> List[Dict[str, Any]]:
+        """Load text file (one record per line)"""
+        return list(self._iter_txt(file_path))
+    
+    def _iter_txt(self, file_path: Path) -> Iterator[Dict[str, Any]]:
+        """Stream records from a text file (one record per line)"""
+        for line_num, line in self._iter_lines(file_path):
+            line = line.decode('utf-8').strip()
+            if line:
+                yield {
+                    "text": line,
+                    "line_number": line_num
+                }
+    
+    def _iter_lines(self, file_path: Path) -> Iterator[Tuple[int, bytes]]:
+        """
+        Memory-map a file and yield its non-blank lines as raw bytes
+        
+        Args:
+            file_path: Path to file
+            
+        Yields:
+            Tuples of (line_number, line) with 1-based line numbers
+        """
+        with open(file_path, 'rb') as f:
+            # mmap cannot map an empty file
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                size = len(mm)
+                start = 0
+                line_num = 0
+                
+                while start < size:
+                    end = mm.find(b'\n', start)
+                    if end == -1:
+                        end = size
+                    line_num += 1
+                    
+                    line = mm[start:end]
+                    if line.strip():
+                        yield line_num, line
+                    start = end + 1
+    
+    def load_from_directory(self, directory: str, pattern: str = "*") -> List[Dict[str, Any]]:
+        """
+        Load all matching files from a directory
+        
+        Args:
+            directory: Directory path
+            pattern: File pattern to match
+            
+        Returns:
+            Combined list of all records
+        """
+        file_paths = self._matching_files(directory, pattern)
+        all_data = []
+        
+        # Files are read on a thread pool so disk reads overlap with parsing;
+        # results are combined in directory order
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            for data in executor.map(self._try_load_data, file_paths):
+                if data is not None:
+                    all_data.extend(data)
+        
+        logger.info(f"Total records loaded: {len(all_data)}")
+        return all_data
+    
+    def _try_load_data(self, file_path: str) -> Optional[List[Dict[str, Any]]]:
+        """Load a file for load_from_directory, logging and returning None on failure"""
+        try:
+            data = self.load_data(file_path)
+            logger.info(f"Loaded {len(data)} records from {os.path.basename(file_path)}")
+            return data
+        except Exception as e:
+            logger.error(f"Error loading {file_path}: {e}")
+            return None
+    
+    def _matching_files(self, directory: str, pattern: str) -> List[str]:
+        """
+        List the files directly inside a directory whose names match a pattern
+        
+        Uses os.scandir, whose entries carry their file type from the
+        directory listing, instead of building and stat-ing a Path per entry.
+        
+        Args:
+            directory: Directory path
+            pattern: Shell-style file name pattern
+            
+        Returns:
+            Matching file paths in directory order
+        """
+        with os.scandir(directory) as entries:
+            return [
+                entry.path for entry in entries
+                if entry.is_file() and fnmatch.fnmatch(entry.name, pattern)
+            ]
+    
+    def iter_from_directory(self, directory: str, pattern: str = "*") -> Iterator[Dict[str, Any]]:
+        """
+        Stream records from all matching files in a directory
+        
+        A file that fails part-way is logged and skipped, but records
+        already yielded from it are not taken back.
+        
+        Args:
+            directory: Directory path
+            pattern: File pattern to match
+            
+        Yields:
+            Data records
+        """
+        for file_path in self._matching_files(directory, pattern):
+            try:
+                yield from self.iter_data(file_path)
+            except Exception as e:
+                logger.error(f"Error loading {file_path}: {e}")
@@ -1,2 +1,2 @@
-# Data transformation module
-
+# Data transformation module
+
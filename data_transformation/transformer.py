@@ -1,173 +1,315 @@
-"""
-Data transformation module - converts data to formats suitable for AI fine-tuning
-"""
-from typing import List, Dict, Any, Optional
-import logging
-
-logger = logging.getLogger(__name__)
-
-class DataTransformer:
-    """Transforms data into formats suitable for generative AI fine-tuning"""
-    
-    def __init__(self, output_format: str = "instruction", config: Dict[str, Any] = None):
-        """
-        Initialize data transformer
-        
-        Args:
-            output_format: Output format (instruction, conversation, completion)
-            config: Configuration dictionary
-        """
-        self.output_format = output_format
-        self.config = config or {}
-        
-        # Get format-specific templates
-        if output_format == "instruction":
-            self.template = self.config.get("instruction_template", {})
-        elif output_format == "conversation":
-            self.template = self.config.get("conversation_template", {})
-        else:
-            self.template = {}
-    
-    def transform_to_instruction_format(self, record: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Transform record to instruction format
-        
-        Format:
-        {
-            "instruction": "...",
-            "input": "...",  # optional
-            "response": "..."
-        }
-        """
-        system_prompt = self.template.get("system_prompt", "You are a helpful AI assistant.")
-        instruction_prefix = self.template.get("instruction_prefix", "### Instruction:\n")
-        response_prefix = self.template.get("response_prefix", "### Response:\n")
-        
-        # Try to extract instruction and response from record
-        instruction = record.get("instruction") or record.get("prompt") or record.get("question") or record.get("input", "")
-        response = record.get("response") or record.get("output") or record.get("answer") or record.get("text", "")
-        input_text = record.get("context") or record.get("input_context", "")
-        
-        # Build formatted text
-        formatted_text = f"{system_prompt}\n\n"
-        if input_text:
-            formatted_text += f"Input: {input_text}\n\n"
-        formatted_text += f"{instruction_prefix}{instruction}\n\n{response_prefix}{response}"
-        
-        return {
-            "instruction": instruction,
-            "input": input_text if input_text else None,
-            "response": response,
-            "text": formatted_text
-        }
-    
-    def transform_to_conversation_format(self, record: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Transform record to conversation format
-        
-        Format:
-        {
-            "messages": [
-                {"role": "system", "content": "..."},
-                {"role": "user", "content": "..."},
-                {"role": "assistant", "content": "..."}
-            ]
-        }
-        """
-        system_prompt = self.template.get("system_prompt", "You are a helpful AI assistant.")
-        user_prefix = self.template.get("user_prefix", "User: ")
-        assistant_prefix = self.template.get("assistant_prefix", "Assistant: ")
-        
-        messages = [
-            {"role": "system", "content": system_prompt}
-        ]
-        
-        # Extract user and assistant messages
-        user_content = record.get("user") or record.get("instruction") or record.get("prompt") or record.get("question", "")
-        assistant_content = record.get("assistant") or record.get("response") or record.get("output") or record.get("answer", "")
-        
-        if user_content:
-            messages.append({"role": "user", "content": user_content})
-        
-        if assistant_content:
-            messages.append({"role": "assistant", "content": assistant_content})
-        
-        # Build formatted text
-        formatted_text = f"{system_prompt}\n\n"
-        if user_content:
-            formatted_text += f"{user_prefix}{user_content}\n\n"
-        if assistant_content:
-            formatted_text += f"{assistant_prefix}{assistant_content}"
-        
-        return {
-            "messages": messages,
-            "text": formatted_text
-        }
-    
-    def transform_to_completion_format(self, record: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Transform record to completion format (simple text continuation)
-        
-        Format:
-        {
-            "prompt": "...",
-            "completion": "..."
-        }
-        """
-        prompt = record.get("prompt") or record.get("instruction") or record.get("input", "")
-        completion = record.get("completion") or record.get("response") or record.get("output") or record.get("text", "")
-        
-        formatted_text = f"{prompt}{completion}"
-        
-        return {
-            "prompt": prompt,
-            "completion": completion,
-            "text": formatted_text
-        }
-    
-    def transform_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Transform a single record based on output format
-        
-        Args:
-            record: Data record to transform
-            
-        Returns:
-            Transformed record
-        """
-        if self.output_format == "instruction":
-            return self.transform_to_instruction_format(record)
-        elif self.output_format == "conversation":
-            return self.transform_to_conversation_format(record)
-        elif self.output_format == "completion":
-            return self.transform_to_completion_format(record)
-        else:
-            logger.warning(f"Unknown format: {self.output_format}, returning record as-is")
-            return record
-    
-    def transform_dataset(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """
-        Transform entire dataset
-        
-        Args:
-            data: List of data records
-            
-        Returns:
-            Transformed dataset
-        """
-        logger.info(f"Transforming {len(data)} records to {self.output_format} format...")
-        
-        transformed_data = []
-        
-        for record in data:
-            try:
-                transformed_record = self.transform_record(record)
-                transformed_data.append(transformed_record)
-            except Exception as e:
-                logger.error(f"Error transforming record: {e}")
-                continue
-        
-        logger.info(f"Transformed {len(transformed_data)} records successfully")
-        
-        return transformed_data
-
+"""
+Data transformation module - converts data to formats suitable for AI fine-tuning
+"""
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence
+import logging
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow is optional, only needed for transform_table
+    pa = None
+    pc = None
+
+logger = logging.getLogger(__name__)
+
+# Source fields tried in order for each extracted value; the first truthy one
+# wins, otherwise the last field's value (default "") is used. The record
+# methods spell the same chains out inline, which is faster than looping
+# over these tuples per record
+FIELD_CANDIDATES = {
+    "instruction": ("instruction", "prompt", "question", "input"),
+    "response": ("response", "output", "answer", "text"),
+    "input_text": ("context", "input_context"),
+    "user": ("user", "instruction", "prompt", "question"),
+    "assistant": ("assistant", "response", "output", "answer"),
+    "prompt": ("prompt", "instruction", "input"),
+    "completion": ("completion", "response", "output", "text"),
+}
+
+class DataTransformer:
+    """Transforms data into formats suitable for generative AI fine-tuning"""
+    
+    def __init__(self, output_format: str = "instruction", config: Dict[str, Any] = None):
+        """
+        Initialize data transformer
+        
+        Args:
+            output_format: Output format (instruction, conversation, completion)
+            config: Configuration dictionary
+        """
+        self.output_format = output_format
+        self.config = config or {}
+        
+        # Get format-specific templates
+        if output_format == "instruction":
+            self.template = self.config.get("instruction_template", {})
+        elif output_format == "conversation":
+            self.template = self.config.get("conversation_template", {})
+        else:
+            self.template = {}
+        
+        # Resolve template strings once instead of on every record
+        self._system_prompt = self.template.get("system_prompt", "You are a helpful AI assistant.")
+        self._instruction_prefix = self.template.get("instruction_prefix", "### Instruction:\n")
+        self._response_prefix = self.template.get("response_prefix", "### Response:\n")
+        self._user_prefix = self.template.get("user_prefix", "User: ")
+        self._assistant_prefix = self.template.get("assistant_prefix", "Assistant: ")
+        self._text_header = f"{self._system_prompt}\n\n"
+        self._response_header = f"\n\n{self._response_prefix}"
+    
+    def transform_to_instruction_format(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transform record to instruction format
+        
+        Format:
+        {
+            "instruction": "...",
+            "input": "...",  # optional
+            "response": "..."
+        }
+        """
+        # Try to extract instruction and response from record
+        instruction = record.get("instruction") or record.get("prompt") or record.get("question") or record.get("input", "")
+        response = record.get("response") or record.get("output") or record.get("answer") or record.get("text", "")
+        input_text = record.get("context") or record.get("input_context", "")
+        
+        # Build formatted text
+        input_block = f"Input: {input_text}\n\n" if input_text else ""
+        formatted_text = (
+            f"{self._text_header}{input_block}{self._instruction_prefix}{instruction}"
+            f"{self._response_header}{response}"
+        )
+        
+        return {
+            "instruction": instruction,
+            "input": input_text if input_text else None,
+            "response": response,
+            "text": formatted_text
+        }
+    
+    def transform_to_conversation_format(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transform record to conversation format
+        
+        Format:
+        {
+            "messages": [
+                {"role": "system", "content": "..."},
+                {"role": "user", "content": "..."},
+                {"role": "assistant", "content": "..."}
+            ]
+        }
+        """
+        messages = [
+            {"role": "system", "content": self._system_prompt}
+        ]
+        
+        # Extract user and assistant messages
+        user_content = record.get("user") or record.get("instruction") or record.get("prompt") or record.get("question", "")
+        assistant_content = record.get("assistant") or record.get("response") or record.get("output") or record.get("answer", "")
+        
+        if user_content:
+            messages.append({"role": "user", "content": user_content})
+        
+        if assistant_content:
+            messages.append({"role": "assistant", "content": assistant_content})
+        
+        # Build formatted text
+        user_block = f"{self._user_prefix}{user_content}\n\n" if user_content else ""
+        assistant_block = f"{self._assistant_prefix}{assistant_content}" if assistant_content else ""
+        formatted_text = f"{self._text_header}{user_block}{assistant_block}"
+        
+        return {
+            "messages": messages,
+            "text": formatted_text
+        }
+    
+    def transform_to_completion_format(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transform record to completion format (simple text continuation)
+        
+        Format:
+        {
+            "prompt": "...",
+            "completion": "..."
+        }
+        """
+        prompt = record.get("prompt") or record.get("instruction") or record.get("input", "")
+        completion = record.get("completion") or record.get("response") or record.get("output") or record.get("text", "")
+        
+        formatted_text = f"{prompt}{completion}"
+        
+        return {
+            "prompt": prompt,
+            "completion": completion,
+            "text": formatted_text
+        }
+    
+    def transform_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transform a single record based on output format
+        
+        Args:
+            record: Data record to transform
+            
+        Returns:
+            Transformed record
+        """
+        if self.output_format == "instruction":
+            return self.transform_to_instruction_format(record)
+        elif self.output_format == "conversation":
+            return self.transform_to_conversation_format(record)
+        elif self.output_format == "completion":
+            return self.transform_to_completion_format(record)
+        else:
+            logger.warning(f"Unknown format: {self.output_format}, returning record as-is")
+            return record
+    
+    def _try_transform_record(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Transform a single record, logging instead of raising on failure
+        
+        Args:
+            record: Data record to transform
+            
+        Returns:
+            Transformed record, or None if the transformation failed
+        """
+        try:
+            return self.transform_record(record)
+        except Exception as e:
+            logger.error(f"Error transforming record: {e}")
+            return None
+    
+    def transform_dataset(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Transform entire dataset
+        
+        Args:
+            data: List of data records
+            
+        Returns:
+            Transformed dataset
+        """
+        logger.info(f"Transforming {len(data)} records to {self.output_format} format...")
+        
+        transformed_records = map(self._try_transform_record, data)
+        transformed_data = [record for record in transformed_records if record is not None]
+        
+        logger.info(f"Transformed {len(transformed_data)} records successfully")
+        
+        return transformed_data
+    
+    def transform_iter(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Transform records one at a time as they are consumed
+        
+        Args:
+            records: Iterable of data records
+            
+        Yields:
+            Transformed records; records that fail to transform are skipped
+        """
+        transformed_count = 0
+        
+        for record in records:
+            transformed_record = self._try_transform_record(record)
+            if transformed_record is not None:
+                transformed_count += 1
+                yield transformed_record
+        
+        logger.info(f"Transformed {transformed_count} records successfully")
+    
+    def transform_table(self, table: "pa.Table") -> "pa.Table":
+        """
+        Transform a pyarrow Table column-wise
+        
+        Instruction and completion formats are built with Arrow string
+        kernels. Conversation format, or tables whose source fields are not
+        all strings, go through transform_dataset row by row.
+        
+        Args:
+            table: Table of data records
+            
+        Returns:
+            Transformed table
+        """
+        transformed = None
+        if self.output_format == "instruction":
+            transformed = self._instruction_table(table)
+        elif self.output_format == "completion":
+            transformed = self._completion_table(table)
+        
+        if transformed is None:
+            return pa.Table.from_pylist(self.transform_dataset(table.to_pylist()))
+        
+        logger.info(f"Transformed {transformed.num_rows} records to {self.output_format} format")
+        return transformed
+    
+    def _instruction_table(self, table: "pa.Table") -> Optional["pa.Table"]:
+        """Column-wise transform_to_instruction_format, or None if not applicable"""
+        instruction = _coalesce_text(table, FIELD_CANDIDATES["instruction"])
+        response = _coalesce_text(table, FIELD_CANDIDATES["response"])
+        input_text = _coalesce_text(table, FIELD_CANDIDATES["input_text"])
+        if instruction is None or response is None or input_text is None:
+            return None
+        
+        has_input = pc.not_equal(input_text, "")
+        input_block = pc.if_else(
+            has_input,
+            pc.binary_join_element_wise("Input: ", input_text, "\n\n", ""),
+            ""
+        )
+        formatted_text = pc.binary_join_element_wise(
+            self._text_header, input_block, self._instruction_prefix, instruction,
+            self._response_header, response, ""
+        )
+        
+        return pa.table({
+            "instruction": instruction,
+            "input": pc.if_else(has_input, input_text, pa.scalar(None, pa.string())),
+            "response": response,
+            "text": formatted_text
+        })
+    
+    def _completion_table(self, table: "pa.Table") -> Optional["pa.Table"]:
+        """Column-wise transform_to_completion_format, or None if not applicable"""
+        prompt = _coalesce_text(table, FIELD_CANDIDATES["prompt"])
+        completion = _coalesce_text(table, FIELD_CANDIDATES["completion"])
+        if prompt is None or completion is None:
+            return None
+        
+        return pa.table({
+            "prompt": prompt,
+            "completion": completion,
+            "text": pc.binary_join_element_wise(prompt, completion, "")
+        })
+
+
+def _coalesce_text(table: "pa.Table", fields: Sequence[str]) -> Optional["pa.ChunkedArray"]:
+    """
+    Column-wise equivalent of record.get(a) or record.get(b) or ... or ""
+    
+    Args:
+        table: Table of data records
+        fields: Candidate fields in order of preference
+        
+    Returns:
+        String column, or None if a candidate field is not a string column
+    """
+    candidates = []
+    for field in fields:
+        if field not in table.column_names:
+            continue
+        column = table.column(field)
+        if pa.types.is_null(column.type):
+            continue
+        if not pa.types.is_string(column.type):
+            return None
+        # Empty strings are falsy, so they fall through to the next field
+        candidates.append(pc.if_else(pc.equal(column, ""), pa.scalar(None, pa.string()), column))
+    
+    if not candidates:
+        return pa.chunked_array([pa.repeat("", table.num_rows)])
+    return pc.coalesce(*candidates, "")
@@ -1,2 +1,2 @@
-# Data validation module
-
+# Data validation module
+
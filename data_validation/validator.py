@@ -1,186 +1,428 @@
-"""
-Data validation module - validates data quality and format
-"""
-from typing import List, Dict, Any, Tuple
-import logging
-
-logger = logging.getLogger(__name__)
-
-class DataValidator:
-    """Validates data quality and format"""
-    
-    def __init__(self, required_fields: List[str] = None, config: Dict[str, Any] = None):
-        """
-        Initialize data validator
-        
-        Args:
-            required_fields: List of required fields
-            config: Configuration dictionary
-        """
-        self.required_fields = required_fields or []
-        self.config = config or {}
-    
-    def validate_record(self, record: Dict[str, Any]) -> Tuple[bool, List[str]]:
-        """
-        Validate a single record
-        
-        Args:
-            record: Data record to validate
-            
-        Returns:
-            Tuple of (is_valid, list_of_errors)
-        """
-        errors = []
-        
-        # Check required fields
-        for field in self.required_fields:
-            if field not in record:
-                errors.append(f"Missing required field: {field}")
-            elif not record[field] or (isinstance(record[field], str) and not record[field].strip()):
-                errors.append(f"Empty required field: {field}")
-        
-        # Check for empty record
-        if not record:
-            errors.append("Record is empty")
-        
-        # Check for valid text content
-        has_text = False
-        for value in record.values():
-            if isinstance(value, str) and value.strip():
-                has_text = True
-                break
-            elif isinstance(value, list) and value:
-                has_text = True
-                break
-            elif isinstance(value, dict) and value:
-                has_text = True
-                break
-        
-        if not has_text:
-            errors.append("Record has no valid text content")
-        
-        return len(errors) == 0, errors
-    
-    def validate_dataset(self, data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-        """
-        Validate entire dataset
-        
-        Args:
-            data: List of data records
-            
-        Returns:
-            Tuple of (valid_records, invalid_records_with_errors)
-        """
-        logger.info(f"Validating {len(data)} records...")
-        
-        valid_records = []
-        invalid_records = []
-        
-        for idx, record in enumerate(data):
-            is_valid, errors = self.validate_record(record)
-            
-            if is_valid:
-                valid_records.append(record)
-            else:
-                invalid_records.append({
-                    "record_index": idx,
-                    "record": record,
-                    "errors": errors
-                })
-                logger.debug(f"Record {idx} invalid: {errors}")
-        
-        logger.info(f"Validation complete: {len(valid_records)} valid, {len(invalid_records)} invalid records")
-        
-        return valid_records, invalid_records
-    
-    def check_duplicates(self, data: List[Dict[str, Any]], key_field: str = "text") -> Tuple[List[Dict[str, Any]], int]:
-        """
-        Check for duplicate records
-        
-        Args:
-            data: List of data records
-            key_field: Field to use for duplicate detection
-            
-        Returns:
-            Tuple of (unique_records, duplicate_count)
-        """
-        seen = set()
-        unique_records = []
-        duplicate_count = 0
-        
-        for record in data:
-            key_value = str(record.get(key_field, ""))
-            
-            if key_value and key_value not in seen:
-                seen.add(key_value)
-                unique_records.append(record)
-            else:
-                duplicate_count += 1
-        
-        if duplicate_count > 0:
-            logger.warning(f"Found {duplicate_count} duplicate records")
-        
-        return unique_records, duplicate_count
-    
-    def generate_quality_report(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """
-        Generate a quality report for the dataset
-        
-        Args:
-            data: List of data records
-            
-        Returns:
-            Quality report dictionary
-        """
-        logger.info("Generating quality report...")
-        
-        report = {
-            "total_records": len(data),
-            "fields": {},
-            "text_length_stats": {},
-            "validation": {}
-        }
-        
-        if not data:
-            return report
-        
-        # Analyze fields
-        all_fields = set()
-        for record in data:
-            all_fields.update(record.keys())
-        
-        report["fields"]["total_unique_fields"] = len(all_fields)
-        report["fields"]["field_names"] = list(all_fields)
-        
-        # Analyze text lengths
-        text_lengths = []
-        for record in data:
-            for value in record.values():
-                if isinstance(value, str):
-                    text_lengths.append(len(value))
-        
-        if text_lengths:
-            report["text_length_stats"] = {
-                "min": min(text_lengths),
-                "max": max(text_lengths),
-                "avg": sum(text_lengths) / len(text_lengths),
-                "median": sorted(text_lengths)[len(text_lengths) // 2]
-            }
-        
-        # Run validation
-        valid_records, invalid_records = self.validate_dataset(data)
-        report["validation"] = {
-            "valid_count": len(valid_records),
-            "invalid_count": len(invalid_records),
-            "validity_rate": len(valid_records) / len(data) if data else 0
-        }
-        
-        # Check duplicates
-        unique_records, duplicate_count = self.check_duplicates(data)
-        report["validation"]["duplicate_count"] = duplicate_count
-        report["validation"]["unique_count"] = len(unique_records)
-        
-        logger.info("Quality report generated")
-        
-        return report
-
+"""
+Data validation module - validates data quality and format
+"""
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+import logging
+
+import numpy as np
+
+from src.utils.hashing import hash_text
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow is optional, only needed for the table methods
+    pa = None
+    pc = None
+
+logger = logging.getLogger(__name__)
+
+# Matches any character Python's str.strip() would keep (RE2's \s is ASCII-only)
+_ARROW_NON_WHITESPACE_PATTERN = r'[^\t-\r\x{1c}-\x{1f}\x{85}\p{Z}]'
+
+# Marks a field absent from a record, distinct from any stored value
+_MISSING = object()
+
+class DataValidator:
+    """Validates data quality and format"""
+    
+    def __init__(self, required_fields: List[str] = None, config: Dict[str, Any] = None):
+        """
+        Initialize data validator
+        
+        Args:
+            required_fields: List of required fields
+            config: Configuration dictionary
+        """
+        self.required_fields = required_fields or []
+        self.config = config or {}
+        
+        # Error messages are built once instead of per record
+        self._missing_msgs = {field: f"Missing required field: {field}" for field in self.required_fields}
+        self._empty_msgs = {field: f"Empty required field: {field}" for field in self.required_fields}
+    
+    def validate_record(self, record: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """
+        Validate a single record
+        
+        Args:
+            record: Data record to validate
+            
+        Returns:
+            Tuple of (is_valid, list_of_errors)
+        """
+        errors = []
+        
+        # Check required fields
+        for field in self.required_fields:
+            value = record.get(field, _MISSING)
+            if value is _MISSING:
+                errors.append(self._missing_msgs[field])
+            elif not value or (isinstance(value, str) and not value.strip()):
+                errors.append(self._empty_msgs[field])
+        
+        # Check for empty record
+        if not record:
+            errors.append("Record is empty")
+        
+        # Check for valid text content
+        has_text = False
+        for value in record.values():
+            if isinstance(value, str):
+                if value.strip():
+                    has_text = True
+                    break
+            elif isinstance(value, (list, dict)) and value:
+                has_text = True
+                break
+        
+        if not has_text:
+            errors.append("Record has no valid text content")
+        
+        return len(errors) == 0, errors
+    
+    def validate_dataset(self, data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Validate entire dataset
+        
+        Args:
+            data: List of data records
+            
+        Returns:
+            Tuple of (valid_records, invalid_records_with_errors)
+        """
+        logger.info(f"Validating {len(data)} records...")
+        
+        valid_records = []
+        invalid_records = []
+        
+        for idx, record in enumerate(data):
+            is_valid, errors = self.validate_record(record)
+            
+            if is_valid:
+                valid_records.append(record)
+            else:
+                invalid_records.append({
+                    "record_index": idx,
+                    "record": record,
+                    "errors": errors
+                })
+                logger.debug(f"Record {idx} invalid: {errors}")
+        
+        logger.info(f"Validation complete: {len(valid_records)} valid, {len(invalid_records)} invalid records")
+        
+        return valid_records, invalid_records
+    
+    def validate_iter(self, records: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], List[str]]]:
+        """
+        Validate records one at a time as they are consumed
+        
+        Args:
+            records: Iterable of data records
+            
+        Yields:
+            Tuples of (record, list_of_errors); an empty list means the record is valid
+        """
+        valid_count = 0
+        invalid_count = 0
+        
+        for idx, record in enumerate(records):
+            is_valid, errors = self.validate_record(record)
+            
+            if is_valid:
+                valid_count += 1
+            else:
+                invalid_count += 1
+                logger.debug(f"Record {idx} invalid: {errors}")
+            
+            yield record, errors
+        
+        logger.info(f"Validation complete: {valid_count} valid, {invalid_count} invalid records")
+    
+    def check_duplicates(self, data: List[Dict[str, Any]], key_field: str = "text") -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Check for duplicate records
+        
+        Args:
+            data: List of data records
+            key_field: Field to use for duplicate detection
+            
+        Returns:
+            Tuple of (unique_records, duplicate_count)
+        """
+        seen = set()
+        unique_records = []
+        duplicate_count = 0
+        
+        for record in data:
+            key_value = str(record.get(key_field, ""))
+            
+            if not key_value:
+                duplicate_count += 1
+                continue
+            
+            key_hash = hash_text(key_value)
+            if key_hash not in seen:
+                seen.add(key_hash)
+                unique_records.append(record)
+            else:
+                duplicate_count += 1
+        
+        if duplicate_count > 0:
+            logger.warning(f"Found {duplicate_count} duplicate records")
+        
+        return unique_records, duplicate_count
+    
+    def generate_quality_report(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Generate a quality report for the dataset
+        
+        Args:
+            data: List of data records
+            
+        Returns:
+            Quality report dictionary
+        """
+        logger.info("Generating quality report...")
+        
+        report = {
+            "total_records": len(data),
+            "fields": {},
+            "text_length_stats": {},
+            "validation": {}
+        }
+        
+        if not data:
+            return report
+        
+        # Collect fields, text lengths, validity and duplicates in one pass
+        all_fields = set()
+        text_lengths = []
+        valid_count = 0
+        seen = set()
+        duplicate_count = 0
+        
+        for record in data:
+            all_fields.update(record.keys())
+            
+            for value in record.values():
+                if isinstance(value, str):
+                    text_lengths.append(len(value))
+            
+            is_valid, _ = self.validate_record(record)
+            if is_valid:
+                valid_count += 1
+            
+            # Same rule as check_duplicates on the "text" field
+            key_value = str(record.get("text", ""))
+            key_hash = hash_text(key_value) if key_value else None
+            if key_hash is not None and key_hash not in seen:
+                seen.add(key_hash)
+            else:
+                duplicate_count += 1
+        
+        report["fields"]["total_unique_fields"] = len(all_fields)
+        report["fields"]["field_names"] = list(all_fields)
+        
+        if text_lengths:
+            text_lengths = np.array(text_lengths, dtype=np.int64)
+            # Upper median via quickselect instead of a full sort
+            middle = text_lengths.size // 2
+            report["text_length_stats"] = {
+                "min": int(text_lengths.min()),
+                "max": int(text_lengths.max()),
+                "avg": float(text_lengths.mean()),
+                "median": int(np.partition(text_lengths, middle)[middle])
+            }
+        
+        report["validation"] = {
+            "valid_count": valid_count,
+            "invalid_count": len(data) - valid_count,
+            "validity_rate": valid_count / len(data),
+            "duplicate_count": duplicate_count,
+            "unique_count": len(seen)
+        }
+        
+        if duplicate_count > 0:
+            logger.warning(f"Found {duplicate_count} duplicate records")
+        
+        logger.info("Quality report generated")
+        
+        return report
+    
+    def validate_table(self, table: "pa.Table") -> Tuple["pa.Table", List[Dict[str, Any]]]:
+        """
+        Validate a pyarrow Table column-wise
+        
+        The checks of validate_record are evaluated as boolean masks over
+        whole columns; only the invalid rows are converted to Python to
+        collect their error messages.
+        
+        Args:
+            table: Table of data records
+            
+        Returns:
+            Tuple of (valid_table, invalid_records_with_errors)
+        """
+        logger.info(f"Validating {table.num_rows} records...")
+        
+        if table.num_rows == 0:
+            logger.info("Validation complete: 0 valid, 0 invalid records")
+            return table, []
+        
+        # A single contiguous mask; some compute kernels crash on masks with
+        # no chunks
+        valid_mask = self._valid_mask(table).combine_chunks()
+        invalid_indices = pc.indices_nonzero(pc.invert(valid_mask))
+        
+        invalid_records = []
+        invalid_rows = table.take(invalid_indices).to_pylist()
+        for idx, record in zip(invalid_indices.to_pylist(), invalid_rows):
+            _, errors = self.validate_record(record)
+            invalid_records.append({
+                "record_index": idx,
+                "record": record,
+                "errors": errors
+            })
+        
+        valid_table = table.filter(valid_mask)
+        logger.info(f"Validation complete: {valid_table.num_rows} valid, {len(invalid_records)} invalid records")
+        
+        return valid_table, invalid_records
+    
+    def _valid_mask(self, table: "pa.Table") -> "pa.ChunkedArray":
+        """Boolean mask of rows that pass validate_record"""
+        if table.num_columns == 0:
+            return pa.chunked_array([pa.repeat(False, table.num_rows)])
+        
+        # Check required fields
+        valid = pa.chunked_array([pa.repeat(True, table.num_rows)])
+        for field in self.required_fields:
+            if field not in table.column_names:
+                return pa.chunked_array([pa.repeat(False, table.num_rows)])
+            valid = pc.and_(valid, _truthy_mask(table.column(field)))
+        
+        # Check for valid text content
+        has_text = pa.chunked_array([pa.repeat(False, table.num_rows)])
+        for column in table.columns:
+            has_text = pc.or_(has_text, _content_mask(column))
+        
+        return pc.and_(valid, has_text)
+    
+    def check_table_duplicates(self, table: "pa.Table", key_field: str = "text") -> int:
+        """
+        Count duplicate records in a pyarrow Table
+        
+        Args:
+            table: Table of data records
+            key_field: Field to use for duplicate detection
+            
+        Returns:
+            Number of duplicate records, counted as in check_duplicates
+        """
+        if key_field not in table.column_names:
+            return table.num_rows
+        
+        column = table.column(key_field)
+        if not pa.types.is_string(column.type):
+            _, duplicate_count = self.check_duplicates(
+                [{key_field: value} for value in column.to_pylist()], key_field
+            )
+            return duplicate_count
+        
+        # Nulls stringify to "None" and empty keys always count as duplicates
+        keys = pc.fill_null(column, "None")
+        unique_count = pc.count_distinct(pc.filter(keys, pc.not_equal(keys, ""))).as_py()
+        duplicate_count = table.num_rows - unique_count
+        
+        if duplicate_count > 0:
+            logger.warning(f"Found {duplicate_count} duplicate records")
+        
+        return duplicate_count
+    
+    def generate_table_report(self, table: "pa.Table") -> Dict[str, Any]:
+        """
+        Generate a quality report for a pyarrow Table
+        
+        Args:
+            table: Table of data records
+            
+        Returns:
+            Quality report dictionary in the same shape as generate_quality_report
+        """
+        logger.info("Generating quality report...")
+        
+        report = {
+            "total_records": table.num_rows,
+            "fields": {},
+            "text_length_stats": {},
+            "validation": {}
+        }
+        
+        if table.num_rows == 0:
+            return report
+        
+        report["fields"]["total_unique_fields"] = table.num_columns
+        report["fields"]["field_names"] = table.column_names
+        
+        # Analyze text lengths
+        lengths = [
+            pc.utf8_length(column).combine_chunks()
+            for column in table.columns if pa.types.is_string(column.type)
+        ]
+        if lengths:
+            text_lengths = pc.drop_null(pa.chunked_array(lengths))
+            if len(text_lengths):
+                min_max = pc.min_max(text_lengths)
+                report["text_length_stats"] = {
+                    "min": min_max["min"].as_py(),
+                    "max": min_max["max"].as_py(),
+                    "avg": pc.mean(text_lengths).as_py(),
+                    # Upper median, as sorted(lengths)[len // 2]
+                    "median": pc.quantile(text_lengths, q=0.5, interpolation="higher")[0].as_py()
+                }
+        
+        # Run validation
+        valid_table, invalid_records = self.validate_table(table)
+        report["validation"] = {
+            "valid_count": valid_table.num_rows,
+            "invalid_count": len(invalid_records),
+            "validity_rate": valid_table.num_rows / table.num_rows
+        }
+        
+        # Check duplicates
+        duplicate_count = self.check_table_duplicates(table)
+        report["validation"]["duplicate_count"] = duplicate_count
+        report["validation"]["unique_count"] = table.num_rows - duplicate_count
+        
+        logger.info("Quality report generated")
+        
+        return report
+
+
+def _truthy_mask(column: "pa.ChunkedArray") -> "pa.ChunkedArray":
+    """Column-wise equivalent of the required-field check in validate_record"""
+    if pa.types.is_string(column.type):
+        mask = pc.match_substring_regex(column, _ARROW_NON_WHITESPACE_PATTERN)
+    elif pa.types.is_boolean(column.type):
+        mask = column
+    elif pa.types.is_integer(column.type) or pa.types.is_floating(column.type):
+        mask = pc.not_equal(column, 0)
+    elif pa.types.is_list(column.type):
+        mask = pc.greater(pc.list_value_length(column), 0)
+    elif pa.types.is_struct(column.type):
+        mask = pc.and_(column.is_valid(), pa.scalar(column.type.num_fields > 0))
+    else:
+        mask = column.is_valid()
+    return pc.fill_null(mask, False)
+
+
+def _content_mask(column: "pa.ChunkedArray") -> "pa.ChunkedArray":
+    """Column-wise equivalent of the text-content check in validate_record"""
+    if pa.types.is_string(column.type):
+        mask = pc.match_substring_regex(column, _ARROW_NON_WHITESPACE_PATTERN)
+    elif pa.types.is_list(column.type) or pa.types.is_struct(column.type):
+        mask = _truthy_mask(column)
+    else:
+        return pa.chunked_array([pa.repeat(False, len(column))])
+    return pc.fill_null(mask, False)
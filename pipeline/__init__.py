@@ -1,2 +1,2 @@
-# Pipeline orchestrator module
-
+# Pipeline orchestrator module
+
@@ -1,229 +1,791 @@
-"""
-Main pipeline orchestrator - coordinates all pipeline stages
-"""
-import json
-import jsonlines
-from pathlib import Path
-from typing import List, Dict, Any, Tuple
-import logging
-import random
-
-from src.data_ingestion.ingestor import DataIngestor
-from src.data_cleaning.cleaner import DataCleaner
-from src.data_transformation.transformer import DataTransformer
-from src.data_validation.validator import DataValidator
-from src.utils.logger import setup_logger
-from src.utils.config_loader import load_config
-
-logger = setup_logger(__name__)
-
-class PipelineOrchestrator:
-    """Main pipeline orchestrator"""
-    
-    def __init__(self, config_path: str = "config.yaml"):
-        """
-        Initialize pipeline orchestrator
-        
-        Args:
-            config_path: Path to configuration file
-        """
-        self.config = load_config(config_path)
-        
-        # Initialize components
-        self.ingestor = DataIngestor(
-            self.config['pipeline']['supported_formats']
-        )
-        
-        self.cleaner = DataCleaner(
-            min_length=self.config['pipeline']['min_text_length'],
-            max_length=self.config['pipeline']['max_text_length']
-        )
-        
-        self.transformer = DataTransformer(
-            output_format=self.config['transformation']['output_format'],
-            config=self.config.get('transformation', {})
-        )
-        
-        self.validator = DataValidator(
-            required_fields=self.config['validation']['required_fields']
-        )
-    
-    def run(self, input_path: str, output_path: str = None) -> Dict[str, Any]:
-        """
-        Run the complete data pipeline
-        
-        Args:
-            input_path: Path to input data file or directory
-            output_path: Optional output path
-            
-        Returns:
-            Pipeline execution report
-        """
-        logger.info("=" * 80)
-        logger.info("Starting Data Engineering Pipeline for Generative AI Fine-tuning")
-        logger.info("=" * 80)
-        
-        report = {
-            "stages": {},
-            "final_stats": {}
-        }
-        
-        try:
-            # Stage 1: Data Ingestion
-            logger.info("\n[Stage 1] Data Ingestion")
-            logger.info("-" * 80)
-            
-            input_path_obj = Path(input_path)
-            if input_path_obj.is_file():
-                data = self.ingestor.load_data(input_path)
-            else:
-                data = self.ingestor.load_from_directory(input_path)
-            
-            report["stages"]["ingestion"] = {
-                "records_loaded": len(data),
-                "status": "success"
-            }
-            logger.info(f"✓ Loaded {len(data)} records")
-            
-            # Stage 2: Data Cleaning
-            logger.info("\n[Stage 2] Data Cleaning")
-            logger.info("-" * 80)
-            
-            data = self.cleaner.clean_dataset(data)
-            
-            if self.config['validation'].get('check_duplicates', True):
-                data = self.cleaner.remove_duplicates(data)
-            
-            if self.config['validation'].get('check_empty_fields', True):
-                required_fields = self.config['validation'].get('required_fields', [])
-                if required_fields:
-                    data = self.cleaner.remove_empty_fields(data, required_fields)
-            
-            report["stages"]["cleaning"] = {
-                "records_after_cleaning": len(data),
-                "status": "success"
-            }
-            logger.info(f"✓ Cleaned dataset: {len(data)} records")
-            
-            # Stage 3: Data Transformation
-            logger.info("\n[Stage 3] Data Transformation")
-            logger.info("-" * 80)
-            
-            data = self.transformer.transform_dataset(data)
-            
-            report["stages"]["transformation"] = {
-                "records_transformed": len(data),
-                "output_format": self.config['transformation']['output_format'],
-                "status": "success"
-            }
-            logger.info(f"✓ Transformed to {self.config['transformation']['output_format']} format")
-            
-            # Stage 4: Data Validation
-            logger.info("\n[Stage 4] Data Validation")
-            logger.info("-" * 80)
-            
-            valid_data, invalid_data = self.validator.validate_dataset(data)
-            
-            report["stages"]["validation"] = {
-                "valid_records": len(valid_data),
-                "invalid_records": len(invalid_data),
-                "status": "success"
-            }
-            logger.info(f"✓ Validated: {len(valid_data)} valid records")
-            
-            # Generate quality report
-            quality_report = self.validator.generate_quality_report(valid_data)
-            report["quality_report"] = quality_report
-            
-            # Stage 5: Save Output
-            logger.info("\n[Stage 5] Saving Output")
-            logger.info("-" * 80)
-            
-            if not output_path:
-                output_path = self.config['data']['output_data_dir']
-            
-            output_path_obj = Path(output_path)
-            output_path_obj.mkdir(parents=True, exist_ok=True)
-            
-            # Split data if needed
-            train_data, val_data = self._split_data(valid_data)
-            
-            # Save datasets
-            train_file = output_path_obj / "train.jsonl"
-            val_file = output_path_obj / "val.jsonl"
-            
-            self._save_jsonl(train_data, train_file)
-            self._save_jsonl(val_data, val_file)
-            
-            logger.info(f"✓ Saved {len(train_data)} training records to {train_file}")
-            logger.info(f"✓ Saved {len(val_data)} validation records to {val_file}")
-            
-            report["stages"]["output"] = {
-                "train_records": len(train_data),
-                "val_records": len(val_data),
-                "train_file": str(train_file),
-                "val_file": str(val_file),
-                "status": "success"
-            }
-            
-            # Final stats
-            report["final_stats"] = {
-                "total_processed": len(data),
-                "total_valid": len(valid_data),
-                "total_invalid": len(invalid_data),
-                "train_size": len(train_data),
-                "val_size": len(val_data)
-            }
-            
-            logger.info("\n" + "=" * 80)
-            logger.info("Pipeline Execution Complete!")
-            logger.info("=" * 80)
-            logger.info(f"Total records processed: {len(data)}")
-            logger.info(f"Valid records: {len(valid_data)}")
-            logger.info(f"Training set: {len(train_data)}")
-            logger.info(f"Validation set: {len(val_data)}")
-            
-            return report
-            
-        except Exception as e:
-            logger.error(f"Pipeline failed: {e}", exc_info=True)
-            report["error"] = str(e)
-            report["status"] = "failed"
-            raise
-    
-    def _split_data(self, data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-        """
-        Split data into train and validation sets
-        
-        Args:
-            data: List of data records
-            
-        Returns:
-            Tuple of (train_data, val_data)
-        """
-        output_config = self.config['output']
-        train_split = output_config['train_split']
-        val_split = output_config['val_split']
-        
-        if output_config.get('shuffle', True):
-            random.seed(output_config.get('seed', 42))
-            random.shuffle(data)
-        
-        split_idx = int(len(data) * train_split)
-        train_data = data[:split_idx]
-        val_data = data[split_idx:split_idx + int(len(data) * val_split)]
-        
-        return train_data, val_data
-    
-    def _save_jsonl(self, data: List[Dict[str, Any]], file_path: Path):
-        """
-        Save data to JSONL file
-        
-        Args:
-            data: List of data records
-            file_path: Output file path
-        """
-        with jsonlines.open(file_path, mode='w') as writer:
-            for record in data:
-                writer.write(record)
-
+"""
+Main pipeline orchestrator - coordinates all pipeline stages
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+import logging
+
+import numpy as np
+
+from src.data_ingestion.ingestor import DataIngestor
+from src.data_cleaning.cleaner import DataCleaner
+from src.data_transformation.transformer import DataTransformer
+from src.data_validation.validator import DataValidator
+from src.utils.arrow_utils import HAS_PYARROW, records_to_table
+from src.utils.json_utils import dumps
+from src.utils.logger import setup_logger
+from src.utils.parallel import threaded_iter
+from src.utils.config_loader import ensure_dirs, load_config
+
+if HAS_PYARROW:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+logger = setup_logger(__name__)
+
+# Rows per batch when streaming intermediate Parquet files between stages
+PARQUET_BATCH_SIZE = 50_000
+
+# Records serialized per write, and the output file buffer size, for JSONL files
+JSONL_WRITE_BATCH_SIZE = 4096
+JSONL_BUFFER_SIZE = 1 << 20
+
+# File suffix for each supported output.format
+OUTPUT_SUFFIXES = {"jsonl": ".jsonl", "parquet": ".parquet", "arrow": ".arrow"}
+
+class PipelineOrchestrator:
+    """Main pipeline orchestrator"""
+    
+    def __init__(self, config_path: str = "config.yaml"):
+        """
+        Initialize pipeline orchestrator
+        
+        Args:
+            config_path: Path to configuration file
+        """
+        self.config = load_config(config_path)
+        ensure_dirs(self.config)
+        
+        # Settings read throughout run() are resolved once here
+        self._check_duplicates = self.config['validation'].get('check_duplicates', True)
+        self._empty_check_fields = []
+        if self.config['validation'].get('check_empty_fields', True):
+            self._empty_check_fields = self.config['validation'].get('required_fields', [])
+        self._output_format = self.config['transformation']['output_format']
+        
+        self._output_file_format = self.config['output'].get('format', 'jsonl')
+        if self._output_file_format not in OUTPUT_SUFFIXES:
+            raise ValueError(f"Unsupported output file format: {self._output_file_format}")
+        if self._output_file_format != 'jsonl' and not HAS_PYARROW:
+            logger.warning(f"pyarrow is not installed, writing jsonl instead of {self._output_file_format}")
+            self._output_file_format = 'jsonl'
+        
+        # null uses every core, 0 and 1 clean in-process. The same count sizes
+        # the cleaning process pool and the thread pool for reading directories
+        n_workers = self.config['pipeline'].get('num_workers', 1)
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        n_workers = max(n_workers, 1)
+        
+        # Initialize components
+        self.ingestor = DataIngestor(
+            self.config['pipeline']['supported_formats'],
+            chunk_size=self.config['pipeline'].get('chunk_size', 10000),
+            n_workers=n_workers
+        )
+        
+        self.cleaner = DataCleaner(
+            min_length=self.config['pipeline']['min_text_length'],
+            max_length=self.config['pipeline']['max_text_length'],
+            n_workers=n_workers,
+            use_bloom=self.config['validation'].get('dedup_bloom_filter', False),
+            expected_n=self.config['validation'].get('dedup_expected_records'),
+            fp_rate=self.config['validation'].get('dedup_fp_rate', 0.001),
+            regex_backend=self.config['pipeline'].get('regex_backend', 're'),
+            dedup_whole_record=self.config['validation'].get('dedup_whole_record', False)
+        )
+        
+        self.transformer = DataTransformer(
+            output_format=self._output_format,
+            config=self.config.get('transformation', {})
+        )
+        
+        self.validator = DataValidator(
+            required_fields=self.config['validation']['required_fields']
+        )
+        
+        # The cleaning steps enabled by the config, bound once for the list
+        # and streaming paths
+        self._cleaning_steps = [self.cleaner.clean_dataset]
+        self._cleaning_iter_steps = [self.cleaner.clean_iter]
+        if self._check_duplicates:
+            self._cleaning_steps.append(self.cleaner.remove_duplicates)
+            self._cleaning_iter_steps.append(self.cleaner.remove_duplicates_iter)
+        if self._empty_check_fields:
+            self._cleaning_steps.append(
+                partial(self.cleaner.remove_empty_fields, required_fields=self._empty_check_fields)
+            )
+            self._cleaning_iter_steps.append(
+                partial(self.cleaner.remove_empty_fields_iter, required_fields=self._empty_check_fields)
+            )
+    
+    def run(self, input_path: str, output_path: str = None, intermediate_dir: str = None) -> Dict[str, Any]:
+        """
+        Run the complete data pipeline
+        
+        Args:
+            input_path: Path to input data file or directory
+            output_path: Optional output path
+            intermediate_dir: Optional directory for Parquet files passed
+                between stages instead of in-memory record lists
+            
+        Returns:
+            Pipeline execution report
+        """
+        logger.info("=" * 80)
+        logger.info("Starting Data Engineering Pipeline for Generative AI Fine-tuning")
+        logger.info("=" * 80)
+        
+        report = {
+            "stages": {},
+            "final_stats": {}
+        }
+        
+        try:
+            if self.config['pipeline'].get('streaming', False):
+                transformed_count, valid_data, invalid_data = self._run_streaming(input_path, report)
+            elif self.config['pipeline'].get('fuse_stages', False):
+                transformed_count, valid_data, invalid_data = self._run_fused(input_path, report)
+            elif self.config['pipeline'].get('columnar', False) and not intermediate_dir:
+                transformed_count, valid_data, invalid_data = self._run_columnar(input_path, report)
+            else:
+                transformed_count, valid_data, invalid_data = self._run_stages(input_path, intermediate_dir, report)
+            
+            # Generate quality report
+            quality_report = self.validator.generate_quality_report(valid_data)
+            report["quality_report"] = quality_report
+            
+            # Stage 5: Save Output
+            logger.info("\n[Stage 5] Saving Output")
+            logger.info("-" * 80)
+            
+            if not output_path:
+                output_path = self.config['data']['output_data_dir']
+            
+            output_path_obj = Path(output_path)
+            output_path_obj.mkdir(parents=True, exist_ok=True)
+            
+            # Split by index: each writer reads its records straight out of
+            # valid_data, so no shuffled copy or per-split list is built
+            train_idx, val_idx = self._split_indices(len(valid_data))
+            
+            # Save datasets
+            train_file, val_file = self._save_splits(valid_data, train_idx, val_idx, output_path_obj)
+            
+            logger.info(f"✓ Saved {len(train_idx)} training records to {train_file}")
+            logger.info(f"✓ Saved {len(val_idx)} validation records to {val_file}")
+            
+            report["stages"]["output"] = {
+                "train_records": len(train_idx),
+                "val_records": len(val_idx),
+                "train_file": str(train_file),
+                "val_file": str(val_file),
+                "status": "success"
+            }
+            
+            # Final stats
+            report["final_stats"] = {
+                "total_processed": transformed_count,
+                "total_valid": len(valid_data),
+                "total_invalid": len(invalid_data),
+                "train_size": len(train_idx),
+                "val_size": len(val_idx)
+            }
+            
+            logger.info("\n" + "=" * 80)
+            logger.info("Pipeline Execution Complete!")
+            logger.info("=" * 80)
+            logger.info(f"Total records processed: {transformed_count}")
+            logger.info(f"Valid records: {len(valid_data)}")
+            logger.info(f"Training set: {len(train_idx)}")
+            logger.info(f"Validation set: {len(val_idx)}")
+            
+            return report
+            
+        except Exception as e:
+            logger.error(f"Pipeline failed: {e}", exc_info=True)
+            report["error"] = str(e)
+            report["status"] = "failed"
+            raise
+    
+    def _run_stages(self, input_path: str, intermediate_dir: Optional[str],
+                    report: Dict[str, Any]) -> Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Run ingestion through validation one full stage at a time
+        
+        Args:
+            input_path: Path to input data file or directory
+            intermediate_dir: Optional directory for Parquet intermediates
+            report: Pipeline report to fill in with per-stage stats
+            
+        Returns:
+            Tuple of (transformed_count, valid_records, invalid_records_with_errors)
+        """
+        data = self._ingest(input_path, report, intermediate_dir)
+        return self._run_record_stages(data, intermediate_dir, report)
+    
+    def _ingest(self, input_path: str, report: Dict[str, Any],
+                intermediate_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Stage 1: load every record from the input file or directory
+        
+        Args:
+            input_path: Path to input data file or directory
+            report: Pipeline report to fill in with ingestion stats
+            intermediate_dir: Optional directory holding the Parquet input cache
+            
+        Returns:
+            List of data records
+        """
+        logger.info("\n[Stage 1] Data Ingestion")
+        logger.info("-" * 80)
+            
+        input_path_obj = Path(input_path)
+        if input_path_obj.is_file() and intermediate_dir:
+            # Re-runs on an unchanged input read the Parquet copy instead of re-parsing
+            data = self.ingestor.load_data_cached(input_path, Path(intermediate_dir) / "cache")
+        elif input_path_obj.is_file():
+            data = self.ingestor.load_data(input_path)
+        else:
+            data = self.ingestor.load_from_directory(input_path)
+            
+        report["stages"]["ingestion"] = {
+            "records_loaded": len(data),
+            "status": "success"
+        }
+        logger.info(f"✓ Loaded {len(data)} records")
+        
+        return data
+    
+    def _run_record_stages(self, data: List[Dict[str, Any]], intermediate_dir: Optional[str],
+                           report: Dict[str, Any]) -> Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Run cleaning through validation on ingested records one full stage at a time
+        
+        Args:
+            data: List of data records
+            intermediate_dir: Optional directory for Parquet intermediates
+            report: Pipeline report to fill in with per-stage stats
+            
+        Returns:
+            Tuple of (transformed_count, valid_records, invalid_records_with_errors)
+        """
+        # Stage 2: Data Cleaning
+        logger.info("\n[Stage 2] Data Cleaning")
+        logger.info("-" * 80)
+            
+        for step in self._cleaning_steps:
+            data = step(data)
+            
+        report["stages"]["cleaning"] = {
+            "records_after_cleaning": len(data),
+            "status": "success"
+        }
+        logger.info(f"✓ Cleaned dataset: {len(data)} records")
+            
+        # Stage 3: Data Transformation
+        logger.info("\n[Stage 3] Data Transformation")
+        logger.info("-" * 80)
+            
+        cleaned_file = None
+        if intermediate_dir:
+            cleaned_file = self._write_intermediate(data, Path(intermediate_dir) / "cleaned.parquet")
+            
+        if cleaned_file:
+            # Release the cleaned records, later stages stream from disk
+            data = None
+            transformed_file = Path(intermediate_dir) / "transformed.parquet"
+            transformed_count = self._transform_intermediate(cleaned_file, transformed_file)
+        else:
+            data = self.transformer.transform_dataset(data)
+            transformed_count = len(data)
+            
+        report["stages"]["transformation"] = {
+            "records_transformed": transformed_count,
+            "output_format": self._output_format,
+            "status": "success"
+        }
+        logger.info(f"✓ Transformed to {self._output_format} format")
+            
+        # Stage 4: Data Validation
+        logger.info("\n[Stage 4] Data Validation")
+        logger.info("-" * 80)
+            
+        if cleaned_file:
+            valid_data, invalid_data = self._validate_intermediate(transformed_file)
+        else:
+            valid_data, invalid_data = self.validator.validate_dataset(data)
+            
+        report["stages"]["validation"] = {
+            "valid_records": len(valid_data),
+            "invalid_records": len(invalid_data),
+            "status": "success"
+        }
+        logger.info(f"✓ Validated: {len(valid_data)} valid records")
+        
+        return transformed_count, valid_data, invalid_data
+    
+    def _run_streaming(self, input_path: str,
+                       report: Dict[str, Any]) -> Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Run ingestion through validation as a chain of generators
+        
+        Records flow through clean -> transform -> validate one at a time,
+        so only the valid records (needed for the shuffled split) are ever
+        held in memory. Cleaning uses the per-record path rather than the
+        vectorized or multi-process dataset methods. With
+        pipeline.streaming_threads, ingestion, cleaning and transformation
+        each run on their own thread, handing batches of
+        pipeline.batch_size records downstream through bounded queues.
+        
+        Args:
+            input_path: Path to input data file or directory
+            report: Pipeline report to fill in with per-stage stats
+            
+        Returns:
+            Tuple of (transformed_count, valid_records, invalid_records_with_errors)
+        """
+        logger.info("\n[Stages 1-4] Streaming Ingestion, Cleaning, Transformation and Validation")
+        logger.info("-" * 80)
+        
+        counts = {"loaded": 0, "cleaned": 0, "transformed": 0}
+        
+        if self.config['pipeline'].get('streaming_threads', False):
+            batch_size = self.config['pipeline'].get('batch_size', 1000)
+            stage_output = lambda records: threaded_iter(records, batch_size)
+        else:
+            stage_output = lambda records: records
+        
+        if Path(input_path).is_file():
+            records = self.ingestor.iter_data(input_path)
+        else:
+            records = self.ingestor.iter_from_directory(input_path)
+        records = stage_output(_counted(records, counts, "loaded"))
+        
+        for step in self._cleaning_iter_steps:
+            records = step(records)
+        records = stage_output(_counted(records, counts, "cleaned"))
+        
+        records = stage_output(_counted(self.transformer.transform_iter(records), counts, "transformed"))
+        
+        valid_data = []
+        invalid_data = []
+        for idx, (record, errors) in enumerate(self.validator.validate_iter(records)):
+            if errors:
+                invalid_data.append({
+                    "record_index": idx,
+                    "record": record,
+                    "errors": errors
+                })
+            else:
+                valid_data.append(record)
+        
+        report["stages"]["ingestion"] = {
+            "records_loaded": counts["loaded"],
+            "status": "success"
+        }
+        report["stages"]["cleaning"] = {
+            "records_after_cleaning": counts["cleaned"],
+            "status": "success"
+        }
+        report["stages"]["transformation"] = {
+            "records_transformed": counts["transformed"],
+            "output_format": self._output_format,
+            "status": "success"
+        }
+        report["stages"]["validation"] = {
+            "valid_records": len(valid_data),
+            "invalid_records": len(invalid_data),
+            "status": "success"
+        }
+        logger.info(f"✓ Streamed {counts['loaded']} records: {len(valid_data)} valid")
+        
+        return counts["transformed"], valid_data, invalid_data
+    
+    def _run_columnar(self, input_path: str,
+                      report: Dict[str, Any]) -> Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Run cleaning through validation on a pyarrow Table
+        
+        The ingested records are converted to one Arrow column per field, so
+        cleaning, duplicate and empty-field removal, transformation and
+        validation run as column kernels and masks. Only valid rows are
+        turned back into dicts. Falls back to _run_stages if pyarrow is
+        missing or the records cannot be stored as Arrow data.
+        
+        Args:
+            input_path: Path to input data file or directory
+            report: Pipeline report to fill in with per-stage stats
+            
+        Returns:
+            Tuple of (transformed_count, valid_records, invalid_records_with_errors)
+        """
+        if not HAS_PYARROW:
+            logger.warning("pyarrow is not installed, running stages on record lists")
+            return self._run_stages(input_path, None, report)
+        
+        data = self._ingest(input_path, report)
+        
+        try:
+            table = records_to_table(data)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.warning(f"Cannot convert records to Arrow ({e}), running stages on record lists")
+            return self._run_record_stages(data, None, report)
+        
+        # Release the record dicts, the table holds the data from here on
+        data = None
+        
+        # Stage 2: Data Cleaning
+        logger.info("\n[Stage 2] Data Cleaning")
+        logger.info("-" * 80)
+        
+        table = self.cleaner.clean_table(table)
+        
+        if self._check_duplicates:
+            table = self.cleaner.remove_table_duplicates(table)
+        
+        if self._empty_check_fields:
+            table = self.cleaner.remove_table_empty_fields(table, self._empty_check_fields)
+        
+        report["stages"]["cleaning"] = {
+            "records_after_cleaning": table.num_rows,
+            "status": "success"
+        }
+        logger.info(f"✓ Cleaned dataset: {table.num_rows} records")
+        
+        # Stage 3: Data Transformation
+        logger.info("\n[Stage 3] Data Transformation")
+        logger.info("-" * 80)
+        
+        table = self.transformer.transform_table(table)
+        
+        report["stages"]["transformation"] = {
+            "records_transformed": table.num_rows,
+            "output_format": self._output_format,
+            "status": "success"
+        }
+        logger.info(f"✓ Transformed to {self._output_format} format")
+        
+        # Stage 4: Data Validation
+        logger.info("\n[Stage 4] Data Validation")
+        logger.info("-" * 80)
+        
+        transformed_count = table.num_rows
+        valid_table, invalid_data = self.validator.validate_table(table)
+        valid_data = valid_table.to_pylist()
+        
+        report["stages"]["validation"] = {
+            "valid_records": len(valid_data),
+            "invalid_records": len(invalid_data),
+            "status": "success"
+        }
+        logger.info(f"✓ Validated: {len(valid_data)} valid records")
+        
+        return transformed_count, valid_data, invalid_data
+    
+    def _run_fused(self, input_path: str,
+                   report: Dict[str, Any]) -> Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Run cleaning through validation as one function applied per record
+        
+        Ingestion loads the full dataset as usual, then each record is
+        cleaned, checked for duplicates and empty fields, transformed and
+        validated in a single traversal, without building a list per stage.
+        Duplicate checks depend on record order, so the traversal runs
+        in-process.
+        
+        Args:
+            input_path: Path to input data file or directory
+            report: Pipeline report to fill in with per-stage stats
+            
+        Returns:
+            Tuple of (transformed_count, valid_records, invalid_records_with_errors)
+        """
+        data = self._ingest(input_path, report)
+        
+        logger.info("\n[Stages 2-4] Fused Cleaning, Transformation and Validation")
+        logger.info("-" * 80)
+        
+        process_record = self._compose_record_stages(expected_n=len(data))
+        cleaned_count = 0
+        valid_data = []
+        invalid_data = []
+        
+        for result in map(process_record, data):
+            if result is None:
+                continue
+            cleaned_count += 1
+            
+            record, errors = result
+            if record is None:
+                continue
+            if errors:
+                invalid_data.append({
+                    "record_index": len(valid_data) + len(invalid_data),
+                    "record": record,
+                    "errors": errors
+                })
+            else:
+                valid_data.append(record)
+        
+        transformed_count = len(valid_data) + len(invalid_data)
+        
+        report["stages"]["cleaning"] = {
+            "records_after_cleaning": cleaned_count,
+            "status": "success"
+        }
+        report["stages"]["transformation"] = {
+            "records_transformed": transformed_count,
+            "output_format": self._output_format,
+            "status": "success"
+        }
+        report["stages"]["validation"] = {
+            "valid_records": len(valid_data),
+            "invalid_records": len(invalid_data),
+            "status": "success"
+        }
+        logger.info(f"✓ Processed {len(data)} records: {cleaned_count} cleaned, "
+                    f"{transformed_count} transformed, {len(valid_data)} valid")
+        
+        return transformed_count, valid_data, invalid_data
+    
+    def _compose_record_stages(self, expected_n: Optional[int] = None) -> Callable[
+            [Dict[str, Any]], Optional[Tuple[Optional[Dict[str, Any]], List[str]]]]:
+        """
+        Fuse the per-record work of stages 2-4 into a single function
+        
+        Args:
+            expected_n: Number of records, if known, for sizing duplicate detection
+            
+        Returns:
+            Function mapping a raw record to None if cleaning removed it,
+            (None, []) if transformation failed, or (transformed_record, errors)
+        """
+        clean = self.cleaner._clean_valid_record
+        transform = self.transformer._try_transform_record
+        validate = self.validator.validate_record
+        
+        is_first_occurrence = None
+        if self._check_duplicates:
+            is_first_occurrence = self.cleaner.first_occurrence_filter(expected_n=expected_n)
+        
+        required_fields = self._empty_check_fields
+        has_required_fields = self.cleaner.has_required_fields
+        
+        def process_record(record: Dict[str, Any]) -> Optional[Tuple[Optional[Dict[str, Any]], List[str]]]:
+            record = clean(record)
+            if record is None:
+                return None
+            if is_first_occurrence is not None and not is_first_occurrence(record):
+                return None
+            if required_fields and not has_required_fields(record, required_fields):
+                return None
+            
+            record = transform(record)
+            if record is None:
+                return None, []
+            
+            _, errors = validate(record)
+            return record, errors
+        
+        return process_record
+    
+    def _write_intermediate(self, data: List[Dict[str, Any]], file_path: Path) -> Optional[Path]:
+        """
+        Write records to a zstd-compressed Parquet file
+        
+        Args:
+            data: List of data records
+            file_path: Output Parquet file path
+            
+        Returns:
+            The written file path, or None if the records cannot be stored as
+            Arrow data and the pipeline should stay in memory
+        """
+        if not HAS_PYARROW:
+            logger.warning("pyarrow is not installed, keeping intermediate data in memory")
+            return None
+        
+        try:
+            table = records_to_table(data)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.warning(f"Cannot convert records to Arrow ({e}), keeping intermediate data in memory")
+            return None
+        
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, file_path, compression='zstd')
+        logger.info(f"Wrote {table.num_rows} records to {file_path}")
+        
+        return file_path
+    
+    def _transform_intermediate(self, source_file: Path, target_file: Path) -> int:
+        """
+        Transform a Parquet file batch by batch into another Parquet file
+        
+        Args:
+            source_file: Cleaned records Parquet file
+            target_file: Output Parquet file for transformed records
+            
+        Returns:
+            Number of transformed records
+        """
+        transformed_count = 0
+        writer = None
+        
+        try:
+            for batch in pq.ParquetFile(source_file).iter_batches(batch_size=PARQUET_BATCH_SIZE):
+                table = self.transformer.transform_table(pa.Table.from_batches([batch]))
+                if writer is None:
+                    writer = pq.ParquetWriter(target_file, table.schema, compression='zstd')
+                else:
+                    table = table.cast(writer.schema)
+                writer.write_table(table)
+                transformed_count += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        if writer is None:
+            # Empty input still needs a file for the validation stage
+            pq.write_table(pa.table({}), target_file)
+        
+        return transformed_count
+    
+    def _validate_intermediate(self, source_file: Path) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Validate a Parquet file batch by batch
+        
+        Args:
+            source_file: Transformed records Parquet file
+            
+        Returns:
+            Tuple of (valid_records, invalid_records_with_errors)
+        """
+        valid_tables = []
+        invalid_data = []
+        offset = 0
+        
+        for batch in pq.ParquetFile(source_file).iter_batches(batch_size=PARQUET_BATCH_SIZE):
+            valid_table, invalid_records = self.validator.validate_table(pa.Table.from_batches([batch]))
+            for invalid in invalid_records:
+                invalid["record_index"] += offset
+            valid_tables.append(valid_table)
+            invalid_data.extend(invalid_records)
+            offset += batch.num_rows
+        
+        valid_data = [record for table in valid_tables for record in table.to_pylist()]
+        
+        return valid_data, invalid_data
+    
+    def _split_indices(self, n: int) -> Tuple[List[int], List[int]]:
+        """
+        Pick which of n records go into the train and validation sets
+        
+        Args:
+            n: Number of valid records
+            
+        Returns:
+            Tuple of (train_indices, val_indices), in output order
+        """
+        output_config = self.config['output']
+        train_split = output_config['train_split']
+        val_split = output_config['val_split']
+        
+        split_idx = int(n * train_split)
+        end_idx = split_idx + int(n * val_split)
+        
+        if output_config.get('shuffle', True):
+            rng = np.random.default_rng(output_config.get('seed', 42))
+            if end_idx < n:
+                # Only the first end_idx positions of the shuffle are used, so
+                # draw an ordered sample of that many indices instead
+                order = rng.choice(n, size=end_idx, replace=False)
+            else:
+                order = rng.permutation(n)
+        else:
+            order = np.arange(end_idx)
+        
+        # Slice the index array first so each split is converted to Python
+        # ints exactly once
+        return order[:split_idx].tolist(), order[split_idx:end_idx].tolist()
+    
+    def _save_splits(self, data: List[Dict[str, Any]], train_idx: List[int], val_idx: List[int],
+                     output_dir: Path) -> Tuple[Path, Path]:
+        """
+        Write the train and validation records in the configured output.format
+        
+        Parquet and Arrow outputs take both splits from one Table built over
+        the valid records; if the records cannot be stored as Arrow data the
+        splits are written as JSONL instead.
+        
+        Args:
+            data: List of valid records
+            train_idx: Indices of the training records, in output order
+            val_idx: Indices of the validation records, in output order
+            output_dir: Directory to write the files to
+            
+        Returns:
+            Tuple of (train_file, val_file)
+        """
+        file_format = self._output_file_format
+        table = None
+        if file_format != 'jsonl':
+            try:
+                table = records_to_table(data)
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                logger.warning(f"Cannot convert records to Arrow ({e}), writing jsonl instead of {file_format}")
+                file_format = 'jsonl'
+        
+        train_file = output_dir / f"train{OUTPUT_SUFFIXES[file_format]}"
+        val_file = output_dir / f"val{OUTPUT_SUFFIXES[file_format]}"
+        
+        # The two files are independent, so write them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            if table is None:
+                train_write = executor.submit(self._save_jsonl, map(data.__getitem__, train_idx), train_file)
+                val_write = executor.submit(self._save_jsonl, map(data.__getitem__, val_idx), val_file)
+            else:
+                # Typed indices, so an empty split isn't inferred as a null array
+                train_rows = table.take(pa.array(train_idx, type=pa.int64()))
+                val_rows = table.take(pa.array(val_idx, type=pa.int64()))
+                train_write = executor.submit(self._save_table, train_rows, train_file, file_format)
+                val_write = executor.submit(self._save_table, val_rows, val_file, file_format)
+            train_write.result()
+            val_write.result()
+        
+        return train_file, val_file
+    
+    def _save_table(self, table: "pa.Table", file_path: Path, file_format: str):
+        """
+        Save a Table as a zstd-compressed Parquet file or an Arrow IPC file
+        
+        Args:
+            table: Records to write
+            file_path: Output file path
+            file_format: "parquet" or "arrow"
+        """
+        if file_format == 'parquet':
+            pq.write_table(table, file_path, compression='zstd')
+        else:
+            with pa.OSFile(str(file_path), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+    
+    def _save_jsonl(self, data: Iterable[Dict[str, Any]], file_path: Path):
+        """
+        Save data to JSONL file
+        
+        Args:
+            data: Data records, consumed once
+            file_path: Output file path
+        """
+        records = iter(data)
+        # Records are encoded a batch at a time and written as one buffer
+        with open(file_path, 'wb', buffering=JSONL_BUFFER_SIZE) as f:
+            while True:
+                batch = list(islice(records, JSONL_WRITE_BATCH_SIZE))
+                if not batch:
+                    break
+                f.write(b'\n'.join(map(dumps, batch)) + b'\n')
+
+
+def _counted(records: Iterable[Dict[str, Any]], counts: Dict[str, int], key: str) -> Iterator[Dict[str, Any]]:
+    """Pass records through unchanged while counting them into counts[key]"""
+    for record in records:
+        counts[key] += 1
+        yield record
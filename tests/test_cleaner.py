@@ -0,0 +1,45 @@
+"""
+Tests for the data cleaner
+"""
+import random
+
+from src.data_cleaning.cleaner import DataCleaner
+from src.utils.arrow_utils import records_to_table
+
+def mixed_records(n: int, seed: int = 0):
+    """Instruction and prompt style records with repeats and missing fields"""
+    rng = random.Random(seed)
+    records = []
+    for _ in range(n):
+        i = rng.randrange(n // 4)
+        if rng.random() < 0.5:
+            record = {"instruction": f"question {i}", "response": f"answer {i % 7}"}
+        else:
+            record = {"prompt": f"question {i}", "completion": f"answer {i % 7}"}
+            if rng.random() < 0.3:
+                # Explicitly empty, as opposed to missing, key fields
+                record["instruction"] = ""
+        records.append(record)
+    return records
+
+def test_table_duplicates_match_record_path():
+    """Missing key fields compare as "" in both the record and table paths"""
+    records = [{"instruction": "first", "response": "kept"}] + mixed_records(2000)
+    cleaner = DataCleaner(min_length=1, max_length=1000)
+    
+    expected = cleaner.remove_duplicates(records)
+    table = cleaner.remove_table_duplicates(records_to_table(records))
+    
+    actual = [{k: v for k, v in row.items() if v is not None} for row in table.to_pylist()]
+    assert actual == expected
+
+def test_table_whole_record_duplicates_match_record_path():
+    """Null columns from the union schema don't split whole-record duplicates"""
+    records = [{"a": 1}, {"a": 1, "b": None}, {"b": "x"}, {"a": None, "b": "x"}, {"a": 2, "b": "y"}]
+    cleaner = DataCleaner(min_length=1, max_length=1000, dedup_whole_record=True)
+    
+    expected = cleaner.remove_duplicates(records)
+    table = cleaner.remove_table_duplicates(records_to_table(records))
+    
+    assert len(expected) == 3
+    assert table.to_pylist() == records_to_table(expected).to_pylist()
@@ -0,0 +1,65 @@
+"""
+Tests for the data ingestor
+"""
+import json
+
+import pytest
+
+from src.data_ingestion import ingestor as ingestor_module
+from src.data_ingestion.ingestor import DataIngestor
+
+def write_jsonl(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+    return path
+
+@pytest.mark.parametrize("records", [
+    # Date-like strings, sparse keys and integer lists convert directly
+    [
+        {"instruction": "a", "sent": "2024-01-02 10:00:00", "tags": [1, 2]},
+        {"instruction": "b", "score": 3},
+        {"instruction": "c", "tags": []},
+    ],
+    # Nested objects and float lists need the line-by-line parser
+    [
+        {"instruction": "a", "meta": {"n": 1}},
+        {"instruction": "b", "meta": {"m": "x"}},
+    ],
+    [
+        {"instruction": "a", "weights": [1, 0.5]},
+    ],
+])
+def test_arrow_jsonl_matches_line_parser(tmp_path, monkeypatch, records):
+    """Records read with the Arrow JSON reader match the line-by-line parser"""
+    path = write_jsonl(tmp_path / "data.jsonl", records)
+    monkeypatch.setattr(ingestor_module, "ARROW_JSONL_MIN_BYTES", 0)
+    ingestor = DataIngestor()
+    
+    loaded = ingestor.load_data(str(path))
+    
+    assert loaded == list(ingestor.iter_jsonl(path))
+    assert loaded == records
+    assert [list(record) for record in loaded] == [list(record) for record in records]
+
+def test_arrow_jsonl_keeps_strings_and_sparse_keys(tmp_path):
+    """Date-like strings stay strings and missing keys are not filled"""
+    records = [
+        {"instruction": "a", "sent": "2024-01-02 10:00:00"},
+        {"instruction": "b", "score": 3},
+    ]
+    path = write_jsonl(tmp_path / "data.jsonl", records)
+    
+    assert DataIngestor().load_jsonl_arrow(path) == records
+
+def test_streaming_csv_survives_late_type_change(tmp_path, monkeypatch):
+    """A column that stops parsing as int after the first block still streams"""
+    path = tmp_path / "data.csv"
+    rows = [f"question {i},{i}" for i in range(500)] + ["last question,ABC"]
+    path.write_text("instruction,code\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    monkeypatch.setattr(ingestor_module, "CSV_BLOCK_SIZE", 1 << 10)
+    ingestor = DataIngestor(chunk_size=64)
+    
+    records = [record for batch in ingestor.iter_csv(path) for record in batch]
+    
+    assert [record["instruction"] for record in records] == [row.split(",")[0] for row in rows]
+    assert records[0]["code"] == 0
+    assert records[-1]["code"] == "ABC"
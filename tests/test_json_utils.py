@@ -0,0 +1,27 @@
+"""
+Tests for the JSON helpers
+"""
+import json
+
+import pytest
+
+from src.utils.json_utils import loads
+
+@pytest.mark.parametrize("document", [
+    '{"score": NaN, "weights": [Infinity, -Infinity]}',
+    '{"id": 123456789012345678901234567890, "ids": [-9223372036854775809]}',
+    '{"id": 18446744073709551615, "big": 1e300, "nested": {"n": 1}}',
+    '123456789012345678901234567890',
+])
+def test_loads_matches_json_module(document):
+    """Documents orjson would reject or change parse as the standard library does"""
+    expected = json.loads(document)
+    
+    for data in (document, document.encode("utf-8")):
+        parsed = loads(data)
+        # NaN never equals itself, so compare through repr
+        assert repr(parsed) == repr(expected)
+
+def test_loads_rejects_invalid_json():
+    with pytest.raises(json.JSONDecodeError):
+        loads(b'{"instruction": ')
@@ -0,0 +1,126 @@
+"""
+Tests for the pipeline orchestrator
+"""
+import json
+from pathlib import Path
+
+import pyarrow.parquet as pq
+import pytest
+import yaml
+
+from src.pipeline.orchestrator import PipelineOrchestrator
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.yaml"
+
+# Pipeline settings selecting each execution mode of run()
+MODES = {
+    "stages": {},
+    "streaming": {"streaming": True},
+    "streaming_threads": {"streaming": True, "streaming_threads": True},
+    "fused": {"fuse_stages": True},
+    "columnar": {"columnar": True},
+}
+
+def make_orchestrator(tmp_path: Path, pipeline_settings: dict = None, output_format: str = "instruction",
+                      **output_settings) -> PipelineOrchestrator:
+    """Build an orchestrator on the repo config with data dirs under tmp_path"""
+    config = yaml.safe_load(CONFIG_PATH.read_text())
+    for key in config['data']:
+        config['data'][key] = str(tmp_path / key)
+    config['pipeline']['num_workers'] = 1
+    config['pipeline'].update(pipeline_settings or {})
+    config['transformation']['output_format'] = output_format
+    config['output'].update(output_settings)
+    
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    return PipelineOrchestrator(config_path=str(config_path))
+
+def write_records(path: Path, n: int) -> Path:
+    """Write n distinct instruction/response records as a JSON file"""
+    records = [
+        {
+            "instruction": f"Explain topic number {i} in a few words",
+            "response": f"Topic number {i} is explained here in a short answer."
+        }
+        for i in range(n)
+    ]
+    path.write_text(json.dumps(records))
+    return path
+
+def mixed_records() -> list:
+    """Records with duplicates, a too-short record and an empty required field"""
+    records = []
+    for i in range(40):
+        records.append({
+            "instruction": f"Explain topic number {i % 30} in a few words",
+            "response": f"Topic number {i % 30} is explained here in a short answer."
+        })
+    records.append({"instruction": "hi", "response": "x"})
+    records.append({"instruction": "This instruction has no response at all", "response": ""})
+    return records
+
+def read_jsonl(path: str) -> list:
+    """Read a JSONL output file"""
+    with open(path, 'rb') as f:
+        return [json.loads(line) for line in f]
+
+def run_mode(tmp_path: Path, mode: str, records: list, output_format: str = "instruction") -> dict:
+    """Run the pipeline on records in one execution mode and return its report"""
+    tmp_path.mkdir(parents=True, exist_ok=True)
+    intermediate_dir = None
+    if mode == "intermediate":
+        settings = {}
+        intermediate_dir = str(tmp_path / "intermediate")
+    else:
+        settings = MODES[mode]
+    orchestrator = make_orchestrator(tmp_path, settings, output_format=output_format)
+    input_file = tmp_path / "input.json"
+    input_file.write_text(json.dumps(records))
+    return orchestrator.run(str(input_file), output_path=str(tmp_path / "out"),
+                            intermediate_dir=intermediate_dir)
+
+@pytest.mark.parametrize("output_format", ["instruction", "conversation", "completion"])
+@pytest.mark.parametrize("mode", [*MODES, "intermediate"])
+def test_modes_match_staged_run(tmp_path, mode, output_format):
+    """Every execution mode writes the same train and val records"""
+    expected = run_mode(tmp_path / "expected", "stages", mixed_records(), output_format)
+    report = run_mode(tmp_path / mode, mode, mixed_records(), output_format)
+    
+    assert report["final_stats"] == expected["final_stats"]
+    for split in ("train_file", "val_file"):
+        actual_records = read_jsonl(report["stages"]["output"][split])
+        expected_records = read_jsonl(expected["stages"]["output"][split])
+        assert actual_records == expected_records
+
+@pytest.mark.parametrize("output_format", ["instruction", "conversation", "completion"])
+@pytest.mark.parametrize("mode", [*MODES, "intermediate"])
+@pytest.mark.parametrize("records", [
+    [],
+    [{"instruction": "hi", "response": "x"}],
+    [{"instruction": "This instruction has no response at all", "response": ""}],
+], ids=["empty", "all_too_short", "all_empty_fields"])
+def test_modes_with_no_valid_records(tmp_path, mode, output_format, records):
+    """Inputs that leave no valid records write empty outputs in every mode"""
+    report = run_mode(tmp_path, mode, records, output_format)
+    
+    assert report["final_stats"]["total_valid"] == 0
+    assert read_jsonl(report["stages"]["output"]["train_file"]) == []
+    assert read_jsonl(report["stages"]["output"]["val_file"]) == []
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_columnar_output_with_empty_val_split(tmp_path, file_format):
+    """Fewer than 10 records leave val empty at val_split 0.1"""
+    orchestrator = make_orchestrator(tmp_path, format=file_format)
+    input_file = write_records(tmp_path / "input.json", 5)
+    
+    report = orchestrator.run(str(input_file), output_path=str(tmp_path / "out"))
+    
+    assert report["final_stats"]["train_size"] == 4
+    assert report["final_stats"]["val_size"] == 0
+    val_file = Path(report["stages"]["output"]["val_file"])
+    assert val_file.suffix == f".{file_format}"
+    if file_format == "parquet":
+        val_table = pq.read_table(val_file)
+        assert val_table.num_rows == 0
+        assert val_table.schema == pq.read_table(report["stages"]["output"]["train_file"]).schema
@@ -1,2 +1,2 @@
-# Utility functions
-
+# Utility functions
+
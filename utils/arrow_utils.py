@@ -0,0 +1,33 @@
+"""
+Helpers for moving record lists into pyarrow Tables
+"""
+from typing import List, Dict, Any
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional, callers check HAS_PYARROW
+    pa = None
+
+HAS_PYARROW = pa is not None
+
+def records_to_table(data: List[Dict[str, Any]]) -> "pa.Table":
+    """
+    Convert a list of records to a pyarrow Table
+    
+    Unlike pa.Table.from_pylist, the schema covers the fields of every
+    record rather than only the first one; missing values become nulls.
+    
+    Args:
+        data: List of data records
+        
+    Returns:
+        Table with one column per field
+        
+    Raises:
+        pa.ArrowInvalid / pa.ArrowTypeError: If a field mixes incompatible types
+    """
+    fields = {}
+    for record in data:
+        fields.update(dict.fromkeys(record))
+    
+    return pa.table({field: [record.get(field) for record in data] for field in fields})
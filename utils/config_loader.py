@@ -1,34 +1,48 @@
-"""
-Configuration loader utility
-"""
-import yaml
-import os
-from pathlib import Path
-
-def load_config(config_path: str = "config.yaml") -> dict:
-    """
-    Load configuration from YAML file
-    
-    Args:
-        config_path: Path to config file
-        
-    Returns:
-        Configuration dictionary
-    """
-    if not os.path.exists(config_path):
-        raise FileNotFoundError(f"Config file not found: {config_path}")
-    
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-    
-    # Create directories if they don't exist
-    for dir_path in [
-        config['data']['raw_data_dir'],
-        config['data']['processed_data_dir'],
-        config['data']['output_data_dir'],
-        config['data']['sample_data_dir']
-    ]:
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
-    
-    return config
-
+"""
+Configuration loader utility
+"""
+import copy
+import yaml
+import os
+from functools import lru_cache
+from pathlib import Path
+
+def load_config(config_path: str = "config.yaml") -> dict:
+    """
+    Load configuration from YAML file
+    
+    The parsed file is cached until it changes on disk; each call returns
+    its own copy, so callers may modify the result.
+    
+    Args:
+        config_path: Path to config file
+    
+    Returns:
+        Configuration dictionary
+    """
+    if not os.path.exists(config_path):
+        raise FileNotFoundError(f"Config file not found: {config_path}")
+    
+    mtime_ns = os.stat(config_path).st_mtime_ns
+    return copy.deepcopy(_read_config(os.path.abspath(config_path), mtime_ns))
+
+@lru_cache(maxsize=8)
+def _read_config(config_path: str, mtime_ns: int) -> dict:
+    """Parse a config file; mtime_ns is part of the cache key only"""
+    with open(config_path, 'r') as f:
+        return yaml.safe_load(f)
+
+def ensure_dirs(config: dict):
+    """
+    Create the data directories named in a configuration
+    
+    Args:
+        config: Configuration dictionary
+    """
+    for dir_path in [
+        config['data']['raw_data_dir'],
+        config['data']['processed_data_dir'],
+        config['data']['output_data_dir'],
+        config['data']['sample_data_dir']
+    ]:
+        Path(dir_path).mkdir(parents=True, exist_ok=True)
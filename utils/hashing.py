@@ -0,0 +1,100 @@
+"""
+Hashing utilities for duplicate detection
+"""
+import hashlib
+from typing import List, Dict, Any
+
+import numpy as np
+
+from src.utils.json_utils import dumps
+
+try:
+    import xxhash
+except ImportError:  # xxhash is optional, fall back to hashlib
+    xxhash = None
+
+# Maps Python's signed hash() values onto the unsigned 64-bit range
+UINT64_MASK = (1 << 64) - 1
+
+def hash_bytes(data: bytes) -> int:
+    """
+    Compute a 64-bit hash of a byte string
+    
+    Args:
+        data: Bytes to hash
+        
+    Returns:
+        Hash as an unsigned 64-bit integer
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+def hash_text(text: str) -> int:
+    """
+    Compute a 64-bit hash of a string
+    
+    Args:
+        text: String to hash
+        
+    Returns:
+        Hash as an unsigned 64-bit integer
+    """
+    return hash_bytes(text.encode('utf-8', 'surrogatepass'))
+
+def record_key_hash(record: Dict[str, Any], key_fields: List[str]) -> int:
+    """
+    Compute a 64-bit hash over the key field values of a record
+    
+    Uses the built-in hash of the tuple of values, which reuses the hashes
+    CPython caches on str objects instead of encoding and rehashing the
+    text. Python seeds str hashes per process, so results are only
+    comparable within one run, which is all duplicate removal needs.
+    
+    Args:
+        record: Data record
+        key_fields: Fields whose values identify the record
+        
+    Returns:
+        Hash as an unsigned 64-bit integer
+    """
+    return hash(tuple([str(record.get(field, "")) for field in key_fields])) & UINT64_MASK
+
+def record_key_hashes(data: List[Dict[str, Any]], key_fields: List[str]) -> np.ndarray:
+    """
+    Compute record_key_hash for every record of a dataset
+    
+    The hashes are built in one generator expression rather than one
+    record_key_hash call per record, which halves the cost.
+    
+    Args:
+        data: List of data records
+        key_fields: Fields whose values identify each record
+        
+    Returns:
+        Unsigned 64-bit hashes in record order
+    """
+    hashes = np.fromiter(
+        (hash(tuple([str(record.get(field, "")) for field in key_fields])) for record in data),
+        dtype=np.int64,
+        count=len(data)
+    )
+    return hashes.view(np.uint64)
+
+def record_hash(record: Dict[str, Any]) -> int:
+    """
+    Compute a 64-bit hash over a whole record
+    
+    The record is encoded as JSON with sorted keys, so records with equal
+    values hash the same regardless of field order. Top-level fields set to
+    None are left out, so a record hashes like its row in a pyarrow Table,
+    where fields the record did not have come back as None.
+    
+    Args:
+        record: Data record
+        
+    Returns:
+        Hash as an unsigned 64-bit integer
+    """
+    present = {field: value for field, value in record.items() if value is not None}
+    return hash_bytes(dumps(present, sort_keys=True))
@@ -0,0 +1,50 @@
+"""
+Compiled kernels for hot per-record scans over numpy arrays
+"""
+import numpy as np
+
+try:
+    from numba import njit, types
+    from numba.typed import Dict as TypedDict
+except ImportError:  # numba is optional, kernels fall back to vectorized numpy
+    njit = None
+
+HAS_NUMBA = njit is not None
+
+
+def _dedup_loop(hashes: np.ndarray) -> np.ndarray:
+    """Loop form of dedup_mask, compiled with numba when available"""
+    out = np.zeros(hashes.size, np.bool_)
+    seen = TypedDict.empty(key_type=types.uint64, value_type=types.boolean)
+    for i in range(hashes.size):
+        if hashes[i] not in seen:
+            seen[hashes[i]] = True
+            out[i] = True
+    return out
+
+
+def _dedup_numpy(hashes: np.ndarray) -> np.ndarray:
+    """Vectorized form of dedup_mask for when numba is not installed"""
+    _, first_index = np.unique(hashes, return_index=True)
+    out = np.zeros(hashes.size, np.bool_)
+    out[first_index] = True
+    return out
+
+
+if HAS_NUMBA:
+    _dedup_kernel = njit(cache=True)(_dedup_loop)
+else:
+    _dedup_kernel = _dedup_numpy
+
+
+def dedup_mask(hashes: np.ndarray) -> np.ndarray:
+    """
+    Mark the first occurrence of every hash
+
+    Args:
+        hashes: 64-bit record hashes in record order
+
+    Returns:
+        Boolean array, True where a hash has not been seen earlier
+    """
+    return _dedup_kernel(np.asarray(hashes, dtype=np.uint64))
@@ -0,0 +1,77 @@
+"""
+JSON serialization helpers - uses orjson when available
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+# orjson parses integers outside the 64-bit range as floats, so a float at
+# least this large may have been an integer in the document
+WIDE_FLOAT = float(2 ** 63)
+
+def _has_wide_float(obj: Any) -> bool:
+    """Check a parsed document for floats too large to be exact 64-bit integers"""
+    if type(obj) is float:
+        return not -WIDE_FLOAT < obj < WIDE_FLOAT
+    if type(obj) is dict:
+        values = obj.values()
+    elif type(obj) is list:
+        values = obj
+    else:
+        return False
+    for value in values:
+        value_type = type(value)
+        if value_type is float:
+            if not -WIDE_FLOAT < value < WIDE_FLOAT:
+                return True
+        elif (value_type is dict or value_type is list) and _has_wide_float(value):
+            return True
+    return False
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document
+    
+    Documents orjson rejects (NaN and Infinity constants) or may have
+    changed (integers wider than 64 bits) are parsed again with the standard
+    library, so results match json.loads.
+    
+    Args:
+        data: UTF-8 encoded bytes or string
+        
+    Returns:
+        Parsed Python object
+    """
+    if orjson is not None:
+        try:
+            obj = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+        else:
+            if not _has_wide_float(obj):
+                return obj
+    return json.loads(data)
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """
+    Serialize an object to compact JSON
+    
+    Args:
+        obj: JSON-serializable Python object
+        sort_keys: Emit dict keys in sorted order, giving one canonical
+            encoding per value
+        
+    Returns:
+        UTF-8 encoded JSON without insignificant whitespace
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else None)
+        except TypeError:
+            # orjson rejects non-string keys and integers beyond 64 bits
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys).encode('utf-8')
@@ -0,0 +1,101 @@
+"""
+Parallel execution helper for per-record pipeline stages
+"""
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Any, Iterable, Iterator
+
+# Below this many records per worker, process start-up and pickling cost
+# more than the work itself
+MIN_RECORDS_PER_WORKER = 1000
+
+# Batches buffered between two threaded stages before the producer blocks
+STAGE_QUEUE_SIZE = 4
+
+# Marks the end of a threaded stage's output
+_DONE = object()
+
+def parallel_map(func: Callable[[Any], Any], items: List[Any], n_workers: int = 1) -> List[Any]:
+    """
+    Apply a function to every item, spreading the work over a process pool
+    
+    Args:
+        func: Picklable callable (module-level function or bound method)
+        items: Items to process
+        n_workers: Number of worker processes, capped at the CPU count
+            (1 runs in-process)
+        
+    Returns:
+        Results in the same order as items
+    """
+    # More processes than cores only add start-up and scheduling cost
+    n_workers = min(n_workers, os.cpu_count() or 1)
+    if n_workers <= 1 or len(items) < n_workers * MIN_RECORDS_PER_WORKER:
+        return list(map(func, items))
+    
+    chunksize = max(1, len(items) // (n_workers * 4))
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
+
+def threaded_iter(items: Iterable[Any], batch_size: int = 1000,
+                  maxsize: int = STAGE_QUEUE_SIZE) -> Iterator[Any]:
+    """
+    Consume an iterable on a background thread and yield its items
+    
+    Items are handed over in batches through a bounded queue, so the
+    producing generator chain runs ahead of the consumer by at most
+    maxsize batches. Chaining several calls gives each stage its own
+    thread, overlapping file reads with processing downstream. An
+    exception raised by the producer is re-raised in the consumer.
+    
+    Args:
+        items: Iterable to consume (only ever advanced by the background thread)
+        batch_size: Number of items per queued batch
+        maxsize: Maximum number of batches waiting in the queue
+        
+    Yields:
+        Items in their original order
+    """
+    batches = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    
+    def put(batch: Any) -> bool:
+        # Give up if the consumer has stopped reading
+        while not stop.is_set():
+            try:
+                batches.put(batch, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def produce() -> None:
+        try:
+            batch = []
+            for item in items:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch and not put(batch):
+                return
+            put(_DONE)
+        except BaseException as e:
+            put(e)
+    
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    
+    try:
+        while True:
+            batch = batches.get()
+            if batch is _DONE:
+                return
+            if isinstance(batch, BaseException):
+                raise batch
+            yield from batch
+    finally:
+        stop.set()